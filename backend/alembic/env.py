@@ -12,13 +12,6 @@ import sys
 # Add the src directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-# Import the Base and models
-from app.models.base import Base
-from app.models.keyword import Keyword
-from app.models.daily_snapshot import DailySnapshot
-from app.models.google_trends_cache import GoogleTrendsCache
-from app.models.user import User
-from app.models.subscription import Subscription
 from app.config import settings
 
 # this is the Alembic Config object, which provides
@@ -29,12 +22,17 @@ config = context.config
 # Supports both SQLite and PostgreSQL
 database_url = settings.database_url
 
+# Computed once; reused by both migration runners below
+_IS_SQLITE = database_url.startswith("sqlite")
+
 # SQLite requires special handling for Alembic
-if database_url.startswith("sqlite"):
-    # Use check_same_thread=False for SQLite
-    config.set_main_option(
-        "sqlalchemy.url", database_url.replace("sqlite:///", "sqlite:///./")
-    )
+if _IS_SQLITE and database_url.startswith("sqlite:///"):
+    # Make relative paths explicit (sqlite:///rel.db -> sqlite:///./rel.db)
+    # without mangling absolute URLs (sqlite:////var/data/db.sqlite)
+    path = database_url[len("sqlite:///") :]
+    if path and not path.startswith(("/", "./")):
+        path = "./" + path
+    config.set_main_option("sqlalchemy.url", "sqlite:///" + path)
 else:
     config.set_main_option("sqlalchemy.url", database_url)
 
@@ -43,16 +41,58 @@ else:
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# add your model's MetaData object here
-# for 'autogenerate' support
-target_metadata = Base.metadata
-
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
 
+def _load_metadata():
+    """
+    Import the models and return the MetaData for 'autogenerate' support.
+
+    Imports are deferred to migration run time so invocations that never
+    touch model metadata don't pay the full model/ORM import cost.
+    """
+    from app.models.base import Base
+    from app.models.keyword import Keyword  # noqa: F401
+    from app.models.daily_snapshot import DailySnapshot  # noqa: F401
+    from app.models.google_trends_cache import GoogleTrendsCache  # noqa: F401
+    from app.models.user import User  # noqa: F401
+    from app.models.subscription import Subscription  # noqa: F401
+
+    return Base.metadata
+
+
+def run_in_batches(connection, select_stmt, update_fn, page_size=500):
+    """
+    Stream a data migration in bounded batches.
+
+    Fetches page_size rows at a time and commits per batch inside an
+    autocommit block, so memory stays O(page_size) and the WAL doesn't
+    balloon on large back-fills. Migration scripts can reach this helper
+    through ``context.config.attributes["run_in_batches"]``.
+
+    Args:
+        connection: the bind from op.get_bind()
+        select_stmt: a SELECT returning the rows still to migrate
+                     (must shrink as update_fn processes rows)
+        update_fn: callable(connection, row) applying the per-row change
+        page_size: rows per batch/commit
+    """
+    while True:
+        rows = connection.execute(select_stmt.limit(page_size)).fetchall()
+        if not rows:
+            break
+        with context.autocommit_block():
+            for row in rows:
+                update_fn(connection, row)
+
+
+# Make the helper reachable from migration scripts
+config.attributes.setdefault("run_in_batches", run_in_batches)
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -66,15 +106,21 @@ def run_migrations_offline() -> None:
 
     """
     url = config.get_main_option("sqlalchemy.url")
+    target_metadata = _load_metadata()
 
     # SQLite-specific configuration
-    if url.startswith("sqlite"):
+    if _IS_SQLITE:
         context.configure(
             url=url,
             target_metadata=target_metadata,
             literal_binds=True,
             dialect_opts={"paramstyle": "named"},
             render_as_batch=True,  # Required for SQLite
+            # Accurate diffs: spurious alters become full table rebuilds
+            # under batch mode, so compare types/defaults precisely
+            compare_type=True,
+            compare_server_default=True,
+            include_schemas=False,
         )
     else:
         context.configure(
@@ -82,6 +128,8 @@ def run_migrations_offline() -> None:
             target_metadata=target_metadata,
             literal_binds=True,
             dialect_opts={"paramstyle": "named"},
+            compare_type=True,
+            compare_server_default=True,
         )
 
     with context.begin_transaction():
@@ -95,14 +143,17 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    url = config.get_main_option("sqlalchemy.url")
+    target_metadata = _load_metadata()
 
     # SQLite requires special connection args
-    if url and url.startswith("sqlite"):
+    if _IS_SQLITE:
+        # StaticPool keeps the single migration connection (and its page
+        # cache / PRAGMA settings) alive across all migration steps,
+        # unlike NullPool which discards it after each checkout
         connectable = engine_from_config(
             config.get_section(config.config_ini_section, {}),
             prefix="sqlalchemy.",
-            poolclass=pool.NullPool,
+            poolclass=pool.StaticPool,
             connect_args={"check_same_thread": False},
         )
     else:
@@ -114,16 +165,23 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         # SQLite-specific configuration
-        if url and url.startswith("sqlite"):
+        if _IS_SQLITE:
             context.configure(
                 connection=connection,
                 target_metadata=target_metadata,
                 render_as_batch=True,  # Required for SQLite
+                # Accurate diffs: spurious alters become full table
+                # rebuilds under batch mode
+                compare_type=True,
+                compare_server_default=True,
+                include_schemas=False,
             )
         else:
             context.configure(
                 connection=connection,
                 target_metadata=target_metadata,
+                compare_type=True,
+                compare_server_default=True,
             )
 
         with context.begin_transaction():
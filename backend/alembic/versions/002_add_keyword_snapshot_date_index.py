@@ -0,0 +1,31 @@
+"""add keyword/snapshot date index for latest-snapshot queries
+
+Revision ID: 002_add_keyword_snapshot_idx
+Revises: 001_add_keyword_fields
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "002_add_keyword_snapshot_idx"
+down_revision = "001_add_keyword_fields"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves the "latest snapshot per keyword" window function: the
+    # ROW_NUMBER() partition/order matches this index exactly, so the
+    # planner reads each keyword's newest rows without a sort
+    op.create_index(
+        "idx_snapshot_keyword_date",
+        "daily_snapshots",
+        ["keyword_id", sa.text("snapshot_date DESC")],
+    )
+
+
+def downgrade():
+    op.drop_index("idx_snapshot_keyword_date", table_name="daily_snapshots")
@@ -0,0 +1,69 @@
+"""add latest keyword snapshot cache table
+
+Revision ID: 003_add_latest_snapshot
+Revises: 002_add_keyword_snapshot_idx
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "003_add_latest_snapshot"
+down_revision = "002_add_keyword_snapshot_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Cache of the newest snapshot per keyword, rewritten by the daily
+    # pipeline so list endpoints read O(keywords) rows instead of
+    # recomputing a groupwise-max over all of daily_snapshots
+    op.create_table(
+        "latest_keyword_snapshot",
+        sa.Column("keyword_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("snapshot_date", sa.Date(), nullable=False),
+        sa.Column("momentum_score", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["keyword_id"],
+            ["keywords.id"],
+        ),
+        sa.PrimaryKeyConstraint("keyword_id"),
+    )
+    op.create_index(
+        "ix_latest_keyword_snapshot_momentum_score",
+        "latest_keyword_snapshot",
+        ["momentum_score"],
+    )
+
+    # Backfill from existing snapshots — the list endpoints read only
+    # this table, so without a backfill they would serve empty results
+    # until the next pipeline run rewrites it. Same ROW_NUMBER()-per-
+    # keyword pass as KeywordService.refresh_latest_snapshots.
+    op.execute(
+        """
+        INSERT INTO latest_keyword_snapshot (keyword_id, snapshot_date, momentum_score)
+        SELECT keyword_id, snapshot_date, momentum_score
+        FROM (
+            SELECT
+                keyword_id,
+                snapshot_date,
+                momentum_score,
+                ROW_NUMBER() OVER (
+                    PARTITION BY keyword_id
+                    ORDER BY snapshot_date DESC
+                ) AS recency_rank
+            FROM daily_snapshots
+        ) ranked
+        WHERE recency_rank = 1
+        """
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_latest_keyword_snapshot_momentum_score",
+        table_name="latest_keyword_snapshot",
+    )
+    op.drop_table("latest_keyword_snapshot")
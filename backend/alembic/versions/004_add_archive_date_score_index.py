@@ -0,0 +1,33 @@
+"""add date/score index for archive pages
+
+Revision ID: 004_add_archive_date_score_idx
+Revises: 003_add_latest_snapshot
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "004_add_archive_date_score_idx"
+down_revision = "003_add_latest_snapshot"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The archive endpoint filters by snapshot_date and orders by
+    # momentum_score DESC; with this index each page is one contiguous
+    # index range scan with no sort. INCLUDE (keyword_id) makes it
+    # covering on Postgres (ignored by SQLite).
+    op.create_index(
+        "idx_snapshot_date_score",
+        "daily_snapshots",
+        ["snapshot_date", sa.text("momentum_score DESC")],
+        postgresql_include=["keyword_id"],
+    )
+
+
+def downgrade():
+    op.drop_index("idx_snapshot_date_score", table_name="daily_snapshots")
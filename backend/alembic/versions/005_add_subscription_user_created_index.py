@@ -0,0 +1,31 @@
+"""add (user_id, created_at) index on subscriptions
+
+Revision ID: 005_add_subscription_user_idx
+Revises: 004_add_archive_date_score_idx
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "005_add_subscription_user_idx"
+down_revision = "004_add_archive_date_score_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The subscription-status endpoint fetches the newest subscription
+    # per user (WHERE user_id ORDER BY created_at DESC LIMIT 1); the
+    # composite index turns that into a single index descent
+    op.create_index(
+        "ix_subscription_user_created",
+        "subscriptions",
+        ["user_id", "created_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_subscription_user_created", table_name="subscriptions")
@@ -0,0 +1,36 @@
+"""add processed_webhook_events ledger
+
+Revision ID: 006_add_processed_events
+Revises: 005_add_subscription_user_idx
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "006_add_processed_events"
+down_revision = "005_add_subscription_user_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Stripe delivers webhooks at-least-once; the handler claims each
+    # event ID here so retried deliveries return 200 without re-running
+    # the subscription updates
+    op.create_table(
+        "processed_webhook_events",
+        sa.Column("event_id", sa.String(length=255), primary_key=True),
+        sa.Column(
+            "processed_at",
+            sa.DateTime(),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("processed_webhook_events")
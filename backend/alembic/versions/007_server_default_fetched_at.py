@@ -0,0 +1,39 @@
+"""move google_trends_cache.fetched_at default server-side
+
+Revision ID: 007_server_default_fetched_at
+Revises: 006_add_processed_events
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "007_server_default_fetched_at"
+down_revision = "006_add_processed_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The database stamps fetched_at itself, so multi-row INSERTs don't
+    # need per-row Python default execution (batch mode for SQLite,
+    # which can't ALTER a column default in place)
+    with op.batch_alter_table("google_trends_cache") as batch_op:
+        batch_op.alter_column(
+            "fetched_at",
+            existing_type=sa.DateTime(),
+            server_default=sa.func.now(),
+            existing_nullable=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("google_trends_cache") as batch_op:
+        batch_op.alter_column(
+            "fetched_at",
+            existing_type=sa.DateTime(),
+            server_default=None,
+            existing_nullable=False,
+        )
@@ -0,0 +1,74 @@
+"""store subscription status as a plain string
+
+Revision ID: 008_subscription_status_string
+Revises: 007_server_default_fetched_at
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "008_subscription_status_string"
+down_revision = "007_server_default_fetched_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Convert the enum column to String(32) holding the lowercase
+    # Stripe status strings. Batch mode handles SQLite's lack of
+    # in-place ALTER; on Postgres the USING cast is implicit via text.
+    with op.batch_alter_table("subscriptions") as batch_op:
+        batch_op.alter_column(
+            "status",
+            existing_type=sa.Enum(
+                "ACTIVE",
+                "CANCELED",
+                "PAST_DUE",
+                "UNPAID",
+                "TRIALING",
+                "INCOMPLETE",
+                "INCOMPLETE_EXPIRED",
+                name="subscriptionstatus",
+            ),
+            type_=sa.String(length=32),
+            existing_nullable=False,
+            postgresql_using="status::text",
+        )
+
+    # SQLEnum stored the member names; rewrite them to the lowercase
+    # Stripe strings the application now uses
+    op.execute("UPDATE subscriptions SET status = LOWER(status)")
+
+    # The auth path filters on status; index it
+    op.create_index("ix_subscriptions_status", "subscriptions", ["status"])
+
+    # The enum's backing type lingers on Postgres once detached
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS subscriptionstatus")
+
+
+def downgrade():
+    op.drop_index("ix_subscriptions_status", table_name="subscriptions")
+    op.execute("UPDATE subscriptions SET status = UPPER(status)")
+    subscriptionstatus = sa.Enum(
+        "ACTIVE",
+        "CANCELED",
+        "PAST_DUE",
+        "UNPAID",
+        "TRIALING",
+        "INCOMPLETE",
+        "INCOMPLETE_EXPIRED",
+        name="subscriptionstatus",
+    )
+    subscriptionstatus.create(op.get_bind(), checkfirst=True)
+    with op.batch_alter_table("subscriptions") as batch_op:
+        batch_op.alter_column(
+            "status",
+            existing_type=sa.String(length=32),
+            type_=subscriptionstatus,
+            existing_nullable=False,
+            postgresql_using="status::subscriptionstatus",
+        )
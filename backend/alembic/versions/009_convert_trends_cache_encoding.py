@@ -0,0 +1,99 @@
+"""convert legacy google_trends_cache rows to zstd+json encoding
+
+Revision ID: 009_trends_cache_encoding
+Revises: 008_subscription_status_string
+Create Date: 2024-01-01 00:00:00.000000
+
+Databases created by the original 001 revision have time_series_data
+as plain JSON text and no time_series_encoding column; the rewritten
+001 creates the compressed layout directly, so fresh databases need
+nothing. This revision brings the legacy databases up to the layout
+the ZstdJSON column type expects: add the encoding column, retype the
+data column to a BLOB, and recompress every existing row.
+"""
+
+import orjson
+import zstandard
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "009_trends_cache_encoding"
+down_revision = "008_subscription_status_string"
+branch_labels = None
+depends_on = None
+
+# First bytes of every zstd frame; rows that already start with it
+# were written by the new codec and must not be compressed twice
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    columns = {
+        column["name"]
+        for column in sa.inspect(bind).get_columns("google_trends_cache")
+    }
+    if "time_series_encoding" in columns:
+        # Table was created by the rewritten 001; already in the
+        # compressed layout
+        return
+
+    encoding_column = sa.Column(
+        "time_series_encoding",
+        sa.String(length=10),
+        nullable=False,
+        server_default="zstd+json",
+    )
+
+    if bind.dialect.name == "sqlite":
+        with op.batch_alter_table("google_trends_cache", schema=None) as batch_op:
+            batch_op.add_column(encoding_column)
+            batch_op.alter_column(
+                "time_series_data",
+                type_=sa.LargeBinary(),
+                existing_nullable=False,
+            )
+    else:
+        op.add_column("google_trends_cache", encoding_column)
+        op.alter_column(
+            "google_trends_cache",
+            "time_series_data",
+            type_=sa.LargeBinary(),
+            existing_nullable=False,
+            postgresql_using="convert_to(time_series_data::text, 'UTF8')",
+        )
+
+    # Recompress the legacy plain-JSON rows with the same codec
+    # ZstdJSON uses, so reads through the ORM decompress cleanly
+    cache_table = sa.table(
+        "google_trends_cache",
+        sa.column("id", sa.Integer),
+        sa.column("time_series_data", sa.LargeBinary),
+    )
+    compressor = zstandard.ZstdCompressor(level=3)
+
+    rows = bind.execute(
+        sa.select(cache_table.c.id, cache_table.c.time_series_data)
+    ).all()
+    for row_id, raw in rows:
+        if raw is None:
+            continue
+        if isinstance(raw, memoryview):
+            raw = raw.tobytes()
+        if isinstance(raw, bytes) and raw.startswith(_ZSTD_MAGIC):
+            continue
+        bind.execute(
+            cache_table.update()
+            .where(cache_table.c.id == row_id)
+            .values(time_series_data=compressor.compress(orjson.dumps(orjson.loads(raw))))
+        )
+
+
+def downgrade():
+    # Intentionally a no-op: on databases created by the rewritten 001
+    # nothing was changed, and reverting legacy databases to the plain
+    # JSON text layout would break every read through the ZstdJSON
+    # column type again.
+    pass
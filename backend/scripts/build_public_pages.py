@@ -16,7 +16,11 @@ Usage:
 import sys
 import os
 import argparse
-import json
+import gzip
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import date, datetime
 from typing import List, Dict, Any, Optional
@@ -24,6 +28,10 @@ from typing import List, Dict, Any, Optional
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+import jinja2
+import orjson
+from sqlalchemy.orm import load_only
+
 from app.database import SessionLocal
 from app.models.keyword import Keyword
 from app.models.daily_snapshot import DailySnapshot
@@ -33,6 +41,18 @@ from app.utils.logging import setup_logging
 
 logger = setup_logging()
 
+# Templates are compiled to bytecode once at import; rendering per
+# keyword then only does variable substitution instead of rebuilding
+# the full HTML (CSS included) as an f-string. Autoescape also closes
+# the hole where keyword text was dropped raw into HTML.
+_jinja_env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(Path(__file__).parent / "templates"),
+    autoescape=True,
+    auto_reload=False,
+)
+KEYWORD_TEMPLATE = _jinja_env.get_template("keyword.html.j2")
+INDEX_TEMPLATE = _jinja_env.get_template("index.html.j2")
+
 
 def get_keywords_with_snapshots(
     db, snapshot_date: Optional[date] = None
@@ -60,32 +80,73 @@ def get_keywords_with_snapshots(
             logger.warning("No snapshots found in database")
             return []
 
-    # Get keywords with snapshots for the date
+    # Get keywords with snapshots for the date.
+    # Three bulk queries instead of 1+2N per-keyword round-trips: one for
+    # keywords, one for all snapshots on the date, one for the trends
+    # caches, each joined up in Python via dicts keyed by keyword_id.
+    # load_only trims each row to the columns actually read below (the
+    # snapshot's google_trends_data JSON blob in particular never loads)
+    # and yield_per streams rows in batches instead of materializing the
+    # whole catalog in the identity map at once.
     keywords_data = []
-    keywords = db.query(Keyword).all()
+    keywords = (
+        db.query(Keyword)
+        .options(
+            load_only(
+                Keyword.id,
+                Keyword.keyword,
+                Keyword.keyword_type,
+                Keyword.first_seen,
+                Keyword.last_seen,
+            )
+        )
+        .yield_per(500)
+    )
 
-    for keyword in keywords:
-        # Get snapshot for this date
-        snapshot = (
-            db.query(DailySnapshot)
-            .filter(DailySnapshot.keyword_id == keyword.id)
-            .filter(DailySnapshot.snapshot_date == snapshot_date)
-            .first()
+    snapshots_by_keyword = {
+        s.keyword_id: s
+        for s in db.query(DailySnapshot)
+        .options(
+            load_only(
+                DailySnapshot.keyword_id,
+                DailySnapshot.snapshot_date,
+                DailySnapshot.momentum_score,
+                DailySnapshot.lift_value,
+                DailySnapshot.acceleration_value,
+                DailySnapshot.novelty_value,
+                DailySnapshot.noise_value,
+            )
         )
+        .filter(DailySnapshot.snapshot_date == snapshot_date)
+        .yield_per(500)
+    }
+
+    # Latest cache per keyword (worldwide, 12 months). Only the two
+    # columns the builder uses come back as plain tuples — no full ORM
+    # row construction, no metadata columns on the wire.
+    trends_query = (
+        db.query(GoogleTrendsCache.keyword_id, GoogleTrendsCache.time_series_data)
+        .filter(GoogleTrendsCache.geo == "")
+        .filter(GoogleTrendsCache.timeframe == "today 12-m")
+        .order_by(GoogleTrendsCache.keyword_id, GoogleTrendsCache.fetched_at.desc())
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        # DISTINCT ON (keyword_id) dedups to the newest row per keyword
+        # inside the database, so old cache history never leaves it
+        trends_query = trends_query.distinct(GoogleTrendsCache.keyword_id)
+
+    # Rows come back newest-first per keyword; setdefault keeps the first
+    # (= latest) one, which is a no-op dedup under DISTINCT ON
+    trends_by_keyword = {}
+    for keyword_id, time_series_data in trends_query.all():
+        trends_by_keyword.setdefault(keyword_id, time_series_data)
+
+    for keyword in keywords:
+        snapshot = snapshots_by_keyword.get(keyword.id)
 
         if not snapshot:
             continue
 
-        # Get Google Trends cache (worldwide, 12 months)
-        trends_cache = (
-            db.query(GoogleTrendsCache)
-            .filter(GoogleTrendsCache.keyword_id == keyword.id)
-            .filter(GoogleTrendsCache.geo == "")
-            .filter(GoogleTrendsCache.timeframe == "today 12-m")
-            .order_by(GoogleTrendsCache.fetched_at.desc())
-            .first()
-        )
-
         keywords_data.append(
             {
                 "id": keyword.id,
@@ -107,7 +168,7 @@ def get_keywords_with_snapshots(
                     "novelty": snapshot.novelty_value,
                     "noise": snapshot.noise_value,
                 },
-                "trends_data": trends_cache.time_series_data if trends_cache else None,
+                "trends_data": trends_by_keyword.get(keyword.id),
             }
         )
 
@@ -117,355 +178,163 @@ def get_keywords_with_snapshots(
     return keywords_data
 
 
-def generate_keyword_page(keyword_data: Dict[str, Any], output_dir: Path) -> None:
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip variants are always built
+    brotli = None
+
+
+def write_compressed_variants(path: Path, data: bytes) -> None:
+    """
+    Emit precompressed .gz (and .br when available) siblings of a page.
+
+    The web server then serves static compressed bytes (gzip_static /
+    brotli_static) instead of compressing per request — compression CPU
+    is paid once at build time, at higher levels than any server would
+    use online.
+    """
+    write_page_bytes(Path(str(path) + ".gz"), gzip.compress(data, compresslevel=9))
+    if brotli is not None:
+        write_page_bytes(Path(str(path) + ".br"), brotli.compress(data, quality=11))
+
+
+def write_page_bytes(path: Path, data: bytes) -> None:
+    """
+    Write a rendered page with a single open/write/close syscall trio.
+
+    Bypasses Python's buffered text layer (encode + buffer copy +
+    flush) — the page is already one bytes object, so one os.write
+    submits it whole.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def generate_keyword_page(
+    keyword_data: Dict[str, Any], output_dir: Path, generated_at: str
+) -> None:
     """
     Generate a static HTML page for a single keyword.
 
     Args:
         keyword_data: Keyword data dictionary
         output_dir: Output directory for pages
+        generated_at: Build timestamp (shared across the whole run)
     """
     keyword = keyword_data["keyword"]
     snapshot = keyword_data["snapshot"]
     trends_data = keyword_data.get("trends_data")
 
-    # Create keyword directory
+    # Directories are pre-created in one pass by main()
     keyword_dir = output_dir / "keywords" / str(keyword_data["id"])
-    keyword_dir.mkdir(parents=True, exist_ok=True)
 
-    # Prepare time series data for chart
+    # Skip pages whose inputs are unchanged since the last build: no
+    # rewrite, no recompression, no CDN invalidation for the (usually
+    # majority) of stable keywords. The hash covers everything that
+    # feeds the render except the footer timestamp.
+    content_key = hashlib.blake2b(
+        repr((keyword, snapshot, trends_data)).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    hash_file = keyword_dir / ".hash"
+    try:
+        if hash_file.read_text() == content_key:
+            logger.info(f"Unchanged page skipped: {keyword}")
+            return
+    except OSError:
+        pass
+
+    # Prepare time series data for chart.
+    # Records from pytrends share one shape, so the value key discovered
+    # on the first record is reused with direct lookups instead of
+    # re-scanning every record's items for a numeric column.
     chart_data = []
     if trends_data and "data" in trends_data:
+        value_key = None
         for record in trends_data["data"]:
-            # Extract date and value from trends data
-            # Format depends on pytrends output
-            date_str = None
-            value = None
-
-            for key, val in record.items():
-                if key == "date" or "date" in key.lower():
-                    date_str = str(val)
-                elif isinstance(val, (int, float)) and key != "isPartial":
-                    value = float(val)
-
-            if date_str and value is not None:
-                chart_data.append({"date": date_str, "value": value})
-
-    # Generate HTML
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{keyword} - TrendEarly</title>
-    <meta name="description" content="Google Trends data for {keyword}">
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background: #f5f5f5;
-        }}
-        .container {{
-            background: white;
-            border-radius: 8px;
-            padding: 30px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        h1 {{
-            margin-top: 0;
-            color: #2563eb;
-        }}
-        .score {{
-            font-size: 3em;
-            font-weight: bold;
-            color: #2563eb;
-            margin: 20px 0;
-        }}
-        .metrics {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin: 30px 0;
-        }}
-        .metric {{
-            padding: 15px;
-            background: #f9fafb;
-            border-radius: 6px;
-        }}
-        .metric-label {{
-            font-size: 0.9em;
-            color: #6b7280;
-            margin-bottom: 5px;
-        }}
-        .metric-value {{
-            font-size: 1.5em;
-            font-weight: bold;
-            color: #111827;
-        }}
-        .chart-container {{
-            margin: 30px 0;
-            padding: 20px;
-            background: #f9fafb;
-            border-radius: 6px;
-        }}
-        .footer {{
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 1px solid #e5e7eb;
-            font-size: 0.9em;
-            color: #6b7280;
-        }}
-        .back-link {{
-            display: inline-block;
-            margin-bottom: 20px;
-            color: #2563eb;
-            text-decoration: none;
-        }}
-        .back-link:hover {{
-            text-decoration: underline;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <a href="/" class="back-link">← Back to Home</a>
-        
-        <h1>{keyword}</h1>
-        
-        <div class="score">{snapshot['momentum_score']}/100</div>
-        <p>Last updated: {snapshot['date']}</p>
-        
-        <div class="metrics">
-            <div class="metric">
-                <div class="metric-label">Lift</div>
-                <div class="metric-value">{snapshot['lift']:.2f}</div>
-            </div>
-            <div class="metric">
-                <div class="metric-label">Acceleration</div>
-                <div class="metric-value">{snapshot['acceleration']:.2f}</div>
-            </div>
-            <div class="metric">
-                <div class="metric-label">Novelty</div>
-                <div class="metric-value">{(snapshot['novelty'] * 100):.1f}%</div>
-            </div>
-            <div class="metric">
-                <div class="metric-label">Noise</div>
-                <div class="metric-value">{snapshot['noise']:.2f}</div>
-            </div>
-        </div>
-"""
-
-    # Add chart if data available
-    if chart_data:
-        # Convert to JSON for JavaScript
-        chart_json = json.dumps(chart_data)
-        html += f"""
-        <div class="chart-container">
-            <h2>Google Trends (Past 12 Months)</h2>
-            <canvas id="trendsChart" width="800" height="400"></canvas>
-            <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-            <script>
-                const chartData = {chart_json};
-                const ctx = document.getElementById('trendsChart').getContext('2d');
-                new Chart(ctx, {{
-                    type: 'line',
-                    data: {{
-                        labels: chartData.map(d => d.date),
-                        datasets: [{{
-                            label: 'Search Interest',
-                            data: chartData.map(d => d.value),
-                            borderColor: '#2563eb',
-                            backgroundColor: 'rgba(37, 99, 235, 0.1)',
-                            tension: 0.4
-                        }}]
-                    }},
-                    options: {{
-                        responsive: true,
-                        maintainAspectRatio: true,
-                        scales: {{
-                            y: {{
-                                beginAtZero: true,
-                                max: 100
-                            }}
-                        }}
-                    }}
-                }});
-            </script>
-        </div>
-"""
-
-    html += f"""
-        <div class="footer">
-            <p>Data source: Google Trends</p>
-            <p>Generated: {datetime.utcnow().isoformat()}</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+            date_str = record.get("date")
+            if date_str is None:
+                for key in record:
+                    if "date" in key.lower():
+                        date_str = record[key]
+                        break
+
+            if value_key is None or value_key not in record:
+                value_key = next(
+                    (
+                        key
+                        for key, val in record.items()
+                        if key != "isPartial"
+                        and "date" not in key.lower()
+                        and isinstance(val, (int, float))
+                    ),
+                    None,
+                )
+            value = record.get(value_key) if value_key else None
+
+            if date_str is not None and isinstance(value, (int, float)):
+                chart_data.append({"date": str(date_str), "value": float(value)})
+
+    # Render the compiled template
+    html = KEYWORD_TEMPLATE.render(
+        keyword=keyword,
+        snapshot=snapshot,
+        chart_json=orjson.dumps(chart_data).decode("ascii") if chart_data else None,
+        generated_at=generated_at,
+    )
 
-    # Write HTML file
+    # Write HTML file plus precompressed variants
     output_file = keyword_dir / "index.html"
-    output_file.write_text(html, encoding="utf-8")
+    page_bytes = html.encode("utf-8")
+    write_page_bytes(output_file, page_bytes)
+    write_compressed_variants(output_file, page_bytes)
+    hash_file.write_text(content_key)
     logger.info(f"Generated page for keyword: {keyword} -> {output_file}")
 
 
-def generate_index_page(keywords_data: List[Dict[str, Any]], output_dir: Path) -> None:
+def generate_index_page(
+    keywords_data: List[Dict[str, Any]], output_dir: Path, generated_at: str
+) -> None:
     """
     Generate index page listing all keywords.
 
     Args:
         keywords_data: List of keyword data dictionaries
         output_dir: Output directory
+        generated_at: Build timestamp (shared across the whole run)
     """
-    html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>TrendEarly - Trending Keywords</title>
-    <meta name="description" content="Discover trending keywords with strong momentum">
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background: #f5f5f5;
-        }
-        .container {
-            background: white;
-            border-radius: 8px;
-            padding: 30px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        h1 {
-            margin-top: 0;
-            color: #2563eb;
-        }
-        .keywords-list {
-            display: grid;
-            gap: 15px;
-            margin-top: 30px;
-        }
-        .keyword-item {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 20px;
-            background: #f9fafb;
-            border-radius: 6px;
-            text-decoration: none;
-            color: inherit;
-            transition: background 0.2s;
-        }
-        .keyword-item:hover {
-            background: #f3f4f6;
-        }
-        .keyword-name {
-            font-size: 1.2em;
-            font-weight: 600;
-            color: #111827;
-        }
-        .keyword-score {
-            font-size: 2em;
-            font-weight: bold;
-            color: #2563eb;
-        }
-        .footer {
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 1px solid #e5e7eb;
-            font-size: 0.9em;
-            color: #6b7280;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>TrendEarly - Trending Keywords</h1>
-        <p>Keywords ranked by momentum score based on Google Trends data</p>
-        
-        <div class="keywords-list">
-"""
-
-    for keyword_data in keywords_data:
-        keyword = keyword_data["keyword"]
-        score = keyword_data["snapshot"]["momentum_score"]
-        keyword_id = keyword_data["id"]
-
-        html += f"""
-            <a href="/keywords/{keyword_id}/" class="keyword-item">
-                <span class="keyword-name">{keyword}</span>
-                <span class="keyword-score">{score}</span>
-            </a>
-"""
-
-    html += (
-        """
-        </div>
-        
-        <div class="footer">
-            <p>Data source: Google Trends</p>
-            <p>Generated: """
-        + datetime.utcnow().isoformat()
-        + """</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    html = INDEX_TEMPLATE.render(
+        keywords_data=keywords_data,
+        generated_at=generated_at,
     )
 
-    # Write index file
+    # Write index file plus precompressed variants
     output_file = output_dir / "index.html"
-    output_file.write_text(html, encoding="utf-8")
+    page_bytes = html.encode("utf-8")
+    write_page_bytes(output_file, page_bytes)
+    write_compressed_variants(output_file, page_bytes)
     logger.info(f"Generated index page: {output_file}")
 
 
-def main():
-    """Main function to generate public pages."""
-    parser = argparse.ArgumentParser(
-        description="Generate static public pages for keywords"
-    )
-    parser.add_argument(
-        "--out",
-        type=str,
-        default=None,
-        help="Output directory for public pages",
-    )
-    parser.add_argument(
-        "--date",
-        type=str,
-        default=None,
-        help="Snapshot date (YYYY-MM-DD), default: most recent",
-    )
-
-    args = parser.parse_args()
+def build_pages(
+    output_dir: Optional[str] = None, snapshot_date: Optional[date] = None
+) -> int:
+    """
+    Generate the public pages; returns the number of keyword pages.
 
-    # Determine output directory
-    output_dir = args.out
+    Importable entry point: the daily pipeline calls this in-process so
+    a nightly build doesn't pay interpreter startup plus a full
+    re-import of the app module graph for a subprocess. Raises
+    RuntimeError when there is nothing to render.
+    """
     if output_dir is None:
         output_dir = getattr(settings, "public_pages_dir", "./public_generated")
 
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Parse date if provided
-    snapshot_date = None
-    if args.date:
-        try:
-            snapshot_date = datetime.strptime(args.date, "%Y-%m-%d").date()
-        except ValueError:
-            logger.error(f"Invalid date format: {args.date}. Use YYYY-MM-DD")
-            sys.exit(1)
-
     logger.info(f"Generating public pages to: {output_path}")
     if snapshot_date:
         logger.info(f"Using snapshot date: {snapshot_date}")
@@ -478,27 +347,93 @@ def main():
         keywords_data = get_keywords_with_snapshots(db, snapshot_date)
 
         if not keywords_data:
-            logger.warning("No keywords with snapshots found")
-            sys.exit(1)
+            raise RuntimeError("No keywords with snapshots found")
 
         logger.info(f"Found {len(keywords_data)} keywords with snapshots")
 
-        # Generate pages
+        # Create all keyword directories in one pass up front, instead
+        # of a mkdir + exist_ok stat inside every page render
+        keywords_root = output_path / "keywords"
+        keywords_root.mkdir(parents=True, exist_ok=True)
         for keyword_data in keywords_data:
-            generate_keyword_page(keyword_data, output_path)
+            try:
+                os.mkdir(keywords_root / str(keyword_data["id"]))
+            except FileExistsError:
+                pass
+
+        # One timestamp for the whole build: every page shares it, so
+        # the clock is read and formatted once instead of per page
+        build_ts = datetime.utcnow().isoformat()
+
+        # Generate pages in parallel: rendering + writing is CPU-bound
+        # string work, independent per keyword, so worker processes
+        # scale it across cores without touching the DB session.
+        # Spawn, not fork: build_pages also runs inside the live API
+        # process (pipeline in-process build), and forking a process
+        # that holds an event loop, scheduler threads, and the SQLite
+        # connection risks deadlocked workers and leaked descriptors.
+        with ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            list(
+                executor.map(
+                    partial(
+                        generate_keyword_page,
+                        output_dir=output_path,
+                        generated_at=build_ts,
+                    ),
+                    keywords_data,
+                    chunksize=16,
+                )
+            )
 
         # Generate index page
-        generate_index_page(keywords_data, output_path)
+        generate_index_page(keywords_data, output_path, build_ts)
 
         logger.info(
             f"Successfully generated {len(keywords_data)} keyword pages + index"
         )
+        return len(keywords_data)
+
+    finally:
+        db.close()
+
+
+def main():
+    """CLI wrapper around build_pages."""
+    parser = argparse.ArgumentParser(
+        description="Generate static public pages for keywords"
+    )
+    parser.add_argument(
+        "--out",
+        type=str,
+        default=None,
+        help="Output directory for public pages",
+    )
+    parser.add_argument(
+        "--date",
+        type=str,
+        default=None,
+        help="Snapshot date (YYYY-MM-DD), default: most recent",
+    )
+
+    args = parser.parse_args()
 
+    # Parse date if provided
+    snapshot_date = None
+    if args.date:
+        try:
+            snapshot_date = datetime.strptime(args.date, "%Y-%m-%d").date()
+        except ValueError:
+            logger.error(f"Invalid date format: {args.date}. Use YYYY-MM-DD")
+            sys.exit(1)
+
+    try:
+        build_pages(args.out, snapshot_date)
     except Exception as e:
         logger.error(f"Error generating public pages: {e}", exc_info=True)
         sys.exit(1)
-    finally:
-        db.close()
 
 
 if __name__ == "__main__":
@@ -16,6 +16,7 @@ from datetime import date
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from sqlalchemy.orm import Session
+from app import models
 from app.database import SessionLocal, init_db
 from app.services.momentum_service import MomentumService
 from app.models.keyword import Keyword
@@ -28,8 +29,16 @@ def main():
     """Main function to calculate momentum scores."""
     logger.info("Starting momentum score calculation")
 
-    # Initialize database
-    init_db()
+    # Register every model module before any ORM use: string
+    # relationship targets must be resolvable for configure_mappers()
+    # whatever subset this script imports, and load_all() is cheap.
+    models.load_all()
+
+    # Initialize database (create tables if needed). Skippable where
+    # migrations own the schema: SKIP_INIT_DB=1 saves the per-table
+    # CREATE TABLE IF NOT EXISTS round trips on every cron invocation.
+    if not os.getenv("SKIP_INIT_DB"):
+        init_db()
 
     # Create service
     momentum_service = MomentumService()
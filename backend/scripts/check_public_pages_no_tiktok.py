@@ -9,8 +9,12 @@ Usage:
     python -m scripts.check_public_pages_no_tiktok <PUBLIC_DIR>
 """
 
+import bisect
+import os
+import re
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Tuple
 
@@ -34,6 +38,19 @@ FORBIDDEN_WORDS = [
     "tiktok.com",
 ]
 
+# All patterns compiled into one scanner, built once at import: a single
+# pass per line replaces 16 substring searches. Case variants collapse
+# to their lowercase form; longest-first ordering makes the alternation
+# prefer the most specific match (e.g. "ads.tiktok.com" over "tiktok").
+_FORBIDDEN_PATTERN = re.compile(
+    b"|".join(
+        re.escape(word.encode("utf-8"))
+        for word in sorted(
+            {w.lower() for w in FORBIDDEN_WORDS}, key=len, reverse=True
+        )
+    )
+)
+
 
 def scan_file(file_path: Path) -> List[Tuple[int, str]]:
     """
@@ -48,19 +65,53 @@ def scan_file(file_path: Path) -> List[Tuple[int, str]]:
     violations = []
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, start=1):
-                line_lower = line.lower()
-                for forbidden in FORBIDDEN_WORDS:
-                    if forbidden.lower() in line_lower:
-                        violations.append((line_num, forbidden))
+        # One read + one ASCII lowercase pass over bytes: no per-line
+        # str allocation or utf-8 decode on the hot path
+        data = file_path.read_bytes().lower()
     except Exception as e:
         print(f"ERROR: Failed to read {file_path}: {e}", file=sys.stderr)
         return [(0, f"READ_ERROR: {e}")]
 
+    line_starts = None
+    for match in _FORBIDDEN_PATTERN.finditer(data):
+        if line_starts is None:
+            # Line numbers are only needed when something matched (the
+            # rare failure case), so the newline index is built lazily
+            line_starts = [m.end() for m in re.finditer(b"\n", data)]
+        line_num = bisect.bisect_right(line_starts, match.start()) + 1
+        violations.append((line_num, match.group(0).decode("utf-8")))
+
     return violations
 
 
+def walk_html_files(root: Path) -> List[Path]:
+    """
+    Recursively collect .html files under root using os.scandir.
+
+    scandir reads the file type from dirent d_type, so classifying each
+    entry needs no extra stat call and no per-entry Path machinery the
+    way pathlib's rglob does.
+
+    Args:
+        root: Directory to walk
+
+    Returns:
+        List of paths to HTML files
+    """
+    files = []
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".html") and entry.is_file(
+                    follow_symlinks=False
+                ):
+                    files.append(Path(entry.path))
+    return files
+
+
 def check_directory(public_dir: Path) -> bool:
     """
     Check all HTML files in the public directory.
@@ -80,7 +131,7 @@ def check_directory(public_dir: Path) -> bool:
         return False
 
     # Find all HTML files
-    html_files = list(public_dir.rglob("*.html"))
+    html_files = walk_html_files(public_dir)
 
     if not html_files:
         print(f"WARNING: No HTML files found in {public_dir}", file=sys.stderr)
@@ -90,12 +141,19 @@ def check_directory(public_dir: Path) -> bool:
 
     total_violations = 0
 
-    for html_file in sorted(html_files):
+    # Scan files in parallel: the read is I/O-bound and the regex scan
+    # runs in C, so threads overlap well. map preserves input order, so
+    # reporting stays deterministic.
+    sorted_files = sorted(html_files)
+    with ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 1) * 4)
+    ) as executor:
+        results = list(executor.map(scan_file, sorted_files))
+
+    for html_file, violations in zip(sorted_files, results):
         relative_path = html_file.relative_to(public_dir)
         print(f"INFO: Checking {relative_path}")
 
-        violations = scan_file(html_file)
-
         if violations:
             total_violations += len(violations)
             for line_num, forbidden in violations:
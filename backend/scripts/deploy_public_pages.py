@@ -10,7 +10,8 @@ import sys
 import os
 import argparse
 import shutil
-import subprocess
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -23,6 +24,37 @@ from app.utils.logging import setup_logging
 logger = setup_logging()
 
 
+def set_tree_ownership_and_mode(
+    root: Path,
+    user: Optional[str] = None,
+    group: Optional[str] = None,
+    mode: int = 0o755,
+) -> None:
+    """
+    Apply ownership and permissions in one in-process directory walk.
+
+    Equivalent to `chown -R user:group root` + `chmod -R mode root`, but
+    without forking two subprocesses that each re-walk the tree: names
+    are resolved to uid/gid once and both changes are applied per entry
+    in a single os.walk pass.
+    """
+    import grp
+    import pwd
+
+    uid = pwd.getpwnam(user).pw_uid if user else -1
+    gid = grp.getgrnam(group).gr_gid if group else -1
+
+    def _apply(path: str) -> None:
+        if uid != -1 or gid != -1:
+            os.chown(path, uid, gid, follow_symlinks=False)
+        os.chmod(path, mode)
+
+    _apply(str(root))
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            _apply(os.path.join(dirpath, name))
+
+
 def deploy_public_pages(
     source_dir: str,
     target_dir: str,
@@ -34,9 +66,9 @@ def deploy_public_pages(
 
     Process:
     1. Generate to temp directory (source_dir)
-    2. Move current public -> public_prev (backup)
-    3. Move temp -> public (atomic swap)
-    4. Remove old backup (optional)
+    2. Move temp into a versioned release directory
+    3. Atomically flip the target symlink to the new release
+    4. Remove the old release in the background
 
     Args:
         source_dir: Source directory (temp, newly generated)
@@ -49,7 +81,7 @@ def deploy_public_pages(
     """
     source_path = Path(source_dir)
     target_path = Path(target_dir)
-    backup_path = Path(f"{target_dir}_prev")
+    releases_path = Path(f"{target_dir}_releases")
 
     if not source_path.exists():
         logger.error(f"Source directory does not exist: {source_dir}")
@@ -60,63 +92,70 @@ def deploy_public_pages(
         return False
 
     try:
-        # Step 1: Backup current public directory if it exists
-        if target_path.exists():
-            logger.info(f"Backing up current public directory to: {backup_path}")
-            if backup_path.exists():
-                shutil.rmtree(backup_path)
-            shutil.move(str(target_path), str(backup_path))
-
-        # Step 2: Move temp directory to public (atomic swap)
-        logger.info(f"Moving {source_dir} -> {target_dir}")
-        shutil.move(str(source_path), str(target_path))
-
-        # Step 3: Set ownership and permissions
-        if user or group:
-            logger.info(f"Setting ownership: user={user}, group={group}")
-            try:
-                # Build chown command
-                ownership = user if user else ""
-                if group:
-                    ownership = f"{ownership}:{group}" if ownership else f":{group}"
-
-                if ownership:
-                    subprocess.run(
-                        ["chown", "-R", ownership, str(target_path)],
-                        check=True,
-                    )
-                    logger.info(f"Set ownership to {ownership}")
-            except subprocess.CalledProcessError as e:
-                logger.warning(f"Failed to set ownership: {e}")
-                # Non-fatal, continue
-
-        # Set permissions (readable by web server)
+        # Step 1: Move the new pages into a versioned release directory
+        releases_path.mkdir(parents=True, exist_ok=True)
+        release_path = releases_path / time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+        logger.info(f"Moving {source_dir} -> {release_path}")
+        shutil.move(str(source_path), str(release_path))
+
+        # Step 2: Set ownership and permissions before the release goes
+        # live — one walk, no chown/chmod subprocess forks
+        logger.info(f"Setting ownership/permissions: user={user}, group={group}")
         try:
-            subprocess.run(["chmod", "-R", "755", str(target_path)], check=True)
-            logger.info("Set permissions to 755")
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Failed to set permissions: {e}")
-
-        # Step 4: Remove old backup (optional, but recommended)
-        if backup_path.exists():
-            logger.info(f"Removing old backup: {backup_path}")
-            shutil.rmtree(backup_path)
+            set_tree_ownership_and_mode(release_path, user=user, group=group)
+            logger.info("Set ownership and 755 permissions")
+        except (OSError, KeyError) as e:
+            logger.warning(f"Failed to set ownership/permissions: {e}")
+            # Non-fatal, continue
+
+        # Step 3: Work out what the target currently points at
+        old_release = None
+        legacy_dir = None
+        if target_path.is_symlink():
+            old_release = os.readlink(str(target_path))
+        elif target_path.exists():
+            # One-time migration from the old real-directory layout:
+            # move it aside so the symlink can take its place
+            legacy_dir = Path(f"{target_dir}_prev")
+            logger.info(f"Migrating legacy directory to: {legacy_dir}")
+            if legacy_dir.exists():
+                shutil.rmtree(legacy_dir)
+            shutil.move(str(target_path), str(legacy_dir))
+
+        # Step 4: Atomic flip — publish the new release with one rename
+        # of a symlink over the target. The site is never missing or
+        # partially updated between two renames.
+        tmp_link = f"{target_dir}.tmp-{os.getpid()}"
+        os.symlink(str(release_path), tmp_link)
+        os.replace(tmp_link, str(target_path))
+        logger.info(f"Switched {target_dir} -> {release_path}")
+
+        # Step 5: Remove the previous release, now unreferenced. The
+        # rmtree of thousands of page files is pure cleanup, so it runs
+        # on a worker thread off the deploy's critical path; join before
+        # returning so the script doesn't exit mid-delete.
+        cleanup_threads = []
+        for stale in (old_release, legacy_dir):
+            if stale and os.path.isdir(stale):
+                logger.info(f"Removing old release in background: {stale}")
+                t = threading.Thread(
+                    target=shutil.rmtree, args=(stale,), kwargs={"ignore_errors": True}
+                )
+                t.start()
+                cleanup_threads.append(t)
 
         logger.info(f"Successfully deployed public pages to: {target_dir}")
+
+        for t in cleanup_threads:
+            t.join()
+
         return True
 
     except Exception as e:
         logger.error(f"Error deploying public pages: {e}", exc_info=True)
-
-        # Attempt to restore from backup if deployment failed
-        if backup_path.exists() and not target_path.exists():
-            logger.info("Attempting to restore from backup...")
-            try:
-                shutil.move(str(backup_path), str(target_path))
-                logger.info("Restored from backup")
-            except Exception as restore_error:
-                logger.error(f"Failed to restore from backup: {restore_error}")
-
+        # The flip is atomic, so the target either still points at the
+        # previous release or already points at the new one — no
+        # restore step is needed.
         return False
 
 
@@ -9,6 +9,8 @@ Usage:
 import asyncio
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import date
 
@@ -16,21 +18,47 @@ from datetime import date
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from sqlalchemy.orm import Session
+from app import models
 from app.database import SessionLocal, init_db
 from app.services.google_trends import GoogleTrendsService
 from app.services.trends_cache import TrendsCache
 from app.services.keyword_service import KeywordService
+from app.utils.keyword_utils import normalize_keyword
 from app.utils.logging import setup_logging
 
 logger = setup_logging()
 
+# Concurrent fetch workers. pytrends' TrendReq mutates per-request state
+# in build_payload, so it cannot be shared across threads; each worker
+# lazily creates its own service (with its own per-thread rate limiter).
+FETCH_WORKERS = 8
+
+_thread_services = threading.local()
+
+
+def _fetch_trends(keyword_text: str):
+    """Fetch trends data on a worker thread using a thread-local service."""
+    service = getattr(_thread_services, "service", None)
+    if service is None:
+        service = GoogleTrendsService()
+        _thread_services.service = service
+    return service.fetch_trends_data(keyword_text, timeframe="today 12-m", geo="")
+
 
 def main():
     """Main function to fetch and cache Google Trends data."""
     logger.info("Starting Google Trends data fetching")
 
-    # Initialize database
-    init_db()
+    # Register every model module before any ORM use: string
+    # relationship targets must be resolvable for configure_mappers()
+    # whatever subset this script imports, and load_all() is cheap.
+    models.load_all()
+
+    # Initialize database (create tables if needed). Skippable where
+    # migrations own the schema: SKIP_INIT_DB=1 saves the per-table
+    # CREATE TABLE IF NOT EXISTS round trips on every cron invocation.
+    if not os.getenv("SKIP_INIT_DB"):
+        init_db()
 
     # Get keywords from command line or use defaults
     if len(sys.argv) > 1:
@@ -39,6 +67,13 @@ def main():
         # Default test keywords
         keyword_texts = ["python", "javascript", "tiktok"]
 
+    # bulk_get_or_create silently drops entries that normalize to
+    # empty, which would surface later as a bare KeyError; reject them
+    # up front like the old per-keyword path did
+    for keyword_text in keyword_texts:
+        if not normalize_keyword(keyword_text):
+            raise ValueError(f"Keyword cannot be empty: {keyword_text!r}")
+
     logger.info(f"Fetching trends for keywords: {keyword_texts}")
 
     # Create service
@@ -46,10 +81,12 @@ def main():
 
     db: Session = SessionLocal()
     try:
-        # Get or create keywords
+        # Get or create all keywords in one bulk upsert instead of a
+        # SELECT-then-INSERT round trip per keyword
+        keyword_map = KeywordService.bulk_get_or_create(db, keyword_texts)
         keyword_ids = []
         for keyword_text in keyword_texts:
-            keyword = KeywordService.get_or_create_keyword(db, keyword_text)
+            keyword = keyword_map[normalize_keyword(keyword_text)]
             keyword_ids.append(keyword.id)
             logger.info(f"Keyword: {keyword.keyword} (ID: {keyword.id})")
 
@@ -57,20 +94,34 @@ def main():
         today = date.today()
         results = {}
 
-        for keyword_text, keyword_id in zip(keyword_texts, keyword_ids):
-            logger.info(f"\nFetching trends for: {keyword_text}")
+        # One IN (...) query loads every fresh cache entry up front
+        # instead of a per-keyword lookup inside the loop
+        cached_map = TrendsCache.get_cached_many(db, keyword_ids, max_age_days=7)
 
-            # Check cache first
-            cached = TrendsCache.get_cached(db, keyword_id, max_age_days=7)
+        missing = []
+        for keyword_text, keyword_id in zip(keyword_texts, keyword_ids):
+            cached = cached_map.get(keyword_id)
             if cached:
                 logger.info(f"Using cached data for '{keyword_text}'")
                 results[keyword_text] = cached
             else:
-                # Fetch fresh data
-                trends_data = trends_service.fetch_trends_data(
-                    keyword_text, timeframe="today 12-m", geo=""
+                missing.append((keyword_text, keyword_id))
+
+        # Fetch the cache misses concurrently: each fetch is an
+        # independent network round trip, so running them on a bounded
+        # thread pool drops wall time from N * latency to roughly
+        # latency at the concurrency cap. Cache writes stay on the main
+        # thread, where the session lives.
+        if missing:
+            logger.info(f"Fetching trends for {len(missing)} uncached keywords")
+            with ThreadPoolExecutor(
+                max_workers=min(FETCH_WORKERS, len(missing))
+            ) as executor:
+                fetched = list(
+                    executor.map(_fetch_trends, (text for text, _ in missing))
                 )
 
+            for (keyword_text, keyword_id), trends_data in zip(missing, fetched):
                 if trends_data:
                     # Save to cache
                     TrendsCache.set_cached(db, keyword_id, today, trends_data)
@@ -96,6 +147,7 @@ def main():
         raise
     finally:
         db.close()
+        trends_service.close()
 
 
 if __name__ == "__main__":
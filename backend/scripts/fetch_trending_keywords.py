@@ -15,6 +15,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from sqlalchemy.orm import Session
+from app import models
 from app.database import SessionLocal, init_db
 from app.services.tiktok_ingestion import TikTokIngestionService, save_keywords_to_database
 from app.utils.logging import setup_logging
@@ -26,8 +27,16 @@ async def main():
     """Main function to fetch and save trending keywords."""
     logger.info("Starting TikTok keyword ingestion")
     
-    # Initialize database (create tables if needed)
-    init_db()
+    # Register every model module before any ORM use: string
+    # relationship targets must be resolvable for configure_mappers()
+    # whatever subset this script imports, and load_all() is cheap.
+    models.load_all()
+
+    # Initialize database (create tables if needed). Skippable where
+    # migrations own the schema: SKIP_INIT_DB=1 saves the per-table
+    # CREATE TABLE IF NOT EXISTS round trips on every cron invocation.
+    if not os.getenv("SKIP_INIT_DB"):
+        init_db()
     
     # Create service
     service = TikTokIngestionService()
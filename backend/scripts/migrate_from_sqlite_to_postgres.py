@@ -6,9 +6,14 @@ Usage:
     python -m scripts.migrate_from_sqlite_to_postgres sqlite:///data.db postgresql://...
 """
 
+import enum
+import io
+import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterable, List, Tuple
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -21,101 +26,294 @@ from app.models.daily_snapshot import DailySnapshot
 from app.models.user import User
 from app.models.subscription import Subscription
 
+
+def _copy_value(value) -> str:
+    """
+    Render one Python value as a PostgreSQL COPY text-format field.
+
+    None becomes \\N, enums use their symbolic name (matching what
+    SQLAlchemy's Enum type stores), JSON columns are serialized, and the
+    COPY metacharacters (backslash, tab, newline) are escaped.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, enum.Enum):
+        value = value.name
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif not isinstance(value, str):
+        value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+# Rows buffered in memory before each COPY statement is sent. Bounds the
+# working set to roughly FLUSH_ROWS * row_size no matter how large the
+# source table is.
+FLUSH_ROWS = 50_000
+
+
+def copy_rows(
+    postgres_db, table: str, columns: List[str], rows: Iterable[Tuple]
+) -> int:
+    """
+    Bulk-load rows into a PostgreSQL table with COPY FROM STDIN.
+
+    COPY checks permissions and column types once for the whole stream
+    and skips per-statement parse/plan work, so it is far faster than
+    issuing one INSERT (let alone one merge) per row. The buffer is
+    flushed every FLUSH_ROWS rows, so the Postgres load starts before
+    the SQLite scan finishes and memory stays bounded.
+
+    Args:
+        postgres_db: PostgreSQL session (its transaction is used)
+        table: Target table name
+        columns: Column names in the order the row tuples provide them
+        rows: Iterable of value tuples
+
+    Returns:
+        Number of rows loaded
+    """
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT text)"
+    buf = io.StringIO()
+    count = 0
+    pending = 0
+    cursor = postgres_db.connection().connection.cursor()
+    try:
+        for row in rows:
+            buf.write("\t".join(_copy_value(value) for value in row))
+            buf.write("\n")
+            count += 1
+            pending += 1
+            if pending >= FLUSH_ROWS:
+                buf.seek(0)
+                cursor.copy_expert(sql, buf)
+                buf.seek(0)
+                buf.truncate(0)
+                pending = 0
+        if pending:
+            buf.seek(0)
+            cursor.copy_expert(sql, buf)
+    finally:
+        cursor.close()
+    return count
+
+
+def bulk_insert_rows(
+    postgres_db, model, columns: List[str], rows: Iterable[Tuple]
+) -> int:
+    """
+    Load rows with chunked bulk_insert_mappings.
+
+    Fallback for drivers without psycopg2's copy_expert. Chunks of
+    10 000 mappings go through one executemany each, which still
+    amortizes statement overhead across the chunk instead of paying it
+    per row.
+
+    Args:
+        postgres_db: Target session (its transaction is used)
+        model: ORM model class for the target table
+        columns: Column names in the order the row tuples provide them
+        rows: Iterable of value tuples
+
+    Returns:
+        Number of rows loaded
+    """
+    count = 0
+    chunk = []
+    for row in rows:
+        chunk.append(dict(zip(columns, row)))
+        if len(chunk) >= 10_000:
+            postgres_db.bulk_insert_mappings(model, chunk)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        postgres_db.bulk_insert_mappings(model, chunk)
+        count += len(chunk)
+    return count
+
+
+def load_rows(
+    postgres_db, model, table: str, columns: List[str], rows: Iterable[Tuple]
+) -> int:
+    """
+    Load rows via COPY when the driver supports it, else executemany.
+
+    Args:
+        postgres_db: Target session
+        model: ORM model class for the target table
+        table: Target table name
+        columns: Column names in the order the row tuples provide them
+        rows: Iterable of value tuples
+
+    Returns:
+        Number of rows loaded
+    """
+    cursor = postgres_db.connection().connection.cursor()
+    supports_copy = hasattr(cursor, "copy_expert")
+    cursor.close()
+
+    if supports_copy:
+        return copy_rows(postgres_db, table, columns, rows)
+    return bulk_insert_rows(postgres_db, model, columns, rows)
+
+
+# Per-table migration specs: model, table name, column order, and a
+# row extractor matching that order. Grouped into waves that respect
+# foreign keys: subscriptions need users, snapshots need keywords, but
+# tables within a wave are independent and migrate concurrently.
+TABLE_SPECS = {
+    "keywords": (
+        Keyword,
+        ["id", "keyword"],
+        lambda k: (k.id, k.keyword),
+    ),
+    "users": (
+        User,
+        ["id", "email", "subscription_tier", "stripe_customer_id"],
+        lambda u: (u.id, u.email, u.subscription_tier, u.stripe_customer_id),
+    ),
+    "subscriptions": (
+        Subscription,
+        ["id", "user_id", "stripe_subscription_id", "status", "current_period_end"],
+        lambda s: (
+            s.id,
+            s.user_id,
+            s.stripe_subscription_id,
+            s.status,
+            s.current_period_end,
+        ),
+    ),
+    "daily_snapshots": (
+        DailySnapshot,
+        [
+            "id",
+            "keyword_id",
+            "snapshot_date",
+            "momentum_score",
+            "raw_score",
+            "lift_value",
+            "acceleration_value",
+            "novelty_value",
+            "noise_value",
+            "google_trends_data",
+        ],
+        lambda s: (
+            s.id,
+            s.keyword_id,
+            s.snapshot_date,
+            s.momentum_score,
+            s.raw_score,
+            s.lift_value,
+            s.acceleration_value,
+            s.novelty_value,
+            s.noise_value,
+            s.google_trends_data,
+        ),
+    ),
+}
+
+MIGRATION_WAVES = [["keywords", "users"], ["subscriptions", "daily_snapshots"]]
+
+
+def migrate_table(SQLiteSession, PostgresSession, table: str) -> int:
+    """
+    Migrate one table on its own pair of sessions.
+
+    Each worker thread opens its own SQLite and Postgres connections and
+    runs in its own transaction, so concurrent table loads don't share
+    session state and a failure in one doesn't poison the others.
+
+    Args:
+        SQLiteSession: Source sessionmaker
+        PostgresSession: Target sessionmaker
+        table: Table name, key into TABLE_SPECS
+
+    Returns:
+        Number of rows migrated
+    """
+    model, columns, row_fn = TABLE_SPECS[table]
+    sqlite_db = SQLiteSession()
+    postgres_db = PostgresSession()
+    try:
+        count = load_rows(
+            postgres_db,
+            model,
+            table,
+            columns,
+            (row_fn(obj) for obj in sqlite_db.query(model).yield_per(5000)),
+        )
+        postgres_db.commit()
+        return count
+    except Exception:
+        postgres_db.rollback()
+        raise
+    finally:
+        sqlite_db.close()
+        postgres_db.close()
+
+
 def migrate_data(sqlite_url: str, postgres_url: str):
     """
     Migrate all data from SQLite to PostgreSQL.
-    
+
     Args:
         sqlite_url: SQLite database URL
         postgres_url: PostgreSQL database URL
     """
-    # Create engines
+    # Create engines. values_plus_batch lets psycopg2 batch any
+    # executemany the fallback path issues instead of one round trip
+    # per statement.
     sqlite_engine = create_engine(sqlite_url)
-    postgres_engine = create_engine(postgres_url)
-    
+    if postgres_url.startswith("postgresql"):
+        postgres_engine = create_engine(
+            postgres_url, executemany_mode="values_plus_batch"
+        )
+    else:
+        postgres_engine = create_engine(postgres_url)
+
     # Create sessions
     SQLiteSession = sessionmaker(bind=sqlite_engine)
     PostgresSession = sessionmaker(bind=postgres_engine)
-    
-    sqlite_db = SQLiteSession()
-    postgres_db = PostgresSession()
-    
+
     try:
         # Create tables in PostgreSQL
         Base.metadata.create_all(bind=postgres_engine)
-        
-        # Migrate keywords
-        print("Migrating keywords...")
-        keywords = sqlite_db.query(Keyword).all()
-        for keyword in keywords:
-            postgres_db.merge(Keyword(id=keyword.id, keyword=keyword.keyword))
-        postgres_db.commit()
-        print(f"Migrated {len(keywords)} keywords")
-        
-        # Migrate users
-        print("Migrating users...")
-        users = sqlite_db.query(User).all()
-        for user in users:
-            postgres_db.merge(User(
-                id=user.id,
-                email=user.email,
-                subscription_tier=user.subscription_tier,
-                stripe_customer_id=user.stripe_customer_id,
-            ))
-        postgres_db.commit()
-        print(f"Migrated {len(users)} users")
-        
-        # Migrate subscriptions
-        print("Migrating subscriptions...")
-        subscriptions = sqlite_db.query(Subscription).all()
-        for sub in subscriptions:
-            postgres_db.merge(Subscription(
-                id=sub.id,
-                user_id=sub.user_id,
-                stripe_subscription_id=sub.stripe_subscription_id,
-                status=sub.status,
-                current_period_end=sub.current_period_end,
-            ))
-        postgres_db.commit()
-        print(f"Migrated {len(subscriptions)} subscriptions")
-        
-        # Migrate daily snapshots
-        print("Migrating daily snapshots...")
-        snapshots = sqlite_db.query(DailySnapshot).all()
-        for snapshot in snapshots:
-            postgres_db.merge(DailySnapshot(
-                id=snapshot.id,
-                keyword_id=snapshot.keyword_id,
-                snapshot_date=snapshot.snapshot_date,
-                momentum_score=snapshot.momentum_score,
-                raw_score=snapshot.raw_score,
-                lift_value=snapshot.lift_value,
-                acceleration_value=snapshot.acceleration_value,
-                novelty_value=snapshot.novelty_value,
-                noise_value=snapshot.noise_value,
-                google_trends_data=snapshot.google_trends_data,
-            ))
-        postgres_db.commit()
-        print(f"Migrated {len(snapshots)} snapshots")
-        
+
+        # Migrate each wave's tables concurrently; the next wave only
+        # starts once its FK targets have fully loaded
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for wave in MIGRATION_WAVES:
+                print(f"Migrating {', '.join(wave)}...")
+                futures = {
+                    table: executor.submit(
+                        migrate_table, SQLiteSession, PostgresSession, table
+                    )
+                    for table in wave
+                }
+                for table, future in futures.items():
+                    print(f"Migrated {future.result()} {table} rows")
+
         print("\nMigration completed successfully!")
-        
+
     except Exception as e:
         print(f"Error during migration: {e}")
-        postgres_db.rollback()
         raise
     finally:
-        sqlite_db.close()
-        postgres_db.close()
+        sqlite_engine.dispose()
+        postgres_engine.dispose()
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
         print("Usage: python -m scripts.migrate_from_sqlite_to_postgres <sqlite_url> <postgres_url>")
         sys.exit(1)
-    
+
     sqlite_url = sys.argv[1]
     postgres_url = sys.argv[2]
-    
-    migrate_data(sqlite_url, postgres_url)
 
+    migrate_data(sqlite_url, postgres_url)
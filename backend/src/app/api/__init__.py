@@ -1,7 +1,22 @@
 """
 API package.
+
+Router modules are resolved lazily (PEP 562): `from app.api import X`
+only imports the stripe SDK, jose, and the rest of each router's
+dependency graph when that router is actually touched, which keeps
+`import app.api` cheap for scripts that never serve HTTP.
 """
 
-from app.api import keywords, archive
+import importlib
+
+_ROUTER_MODULES = ("keywords", "archive", "auth", "stripe")
+
+__all__ = list(_ROUTER_MODULES)
+
 
-__all__ = ["keywords", "archive"]
+def __getattr__(name):
+    if name in _ROUTER_MODULES:
+        module = importlib.import_module(f"app.api.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,15 +5,23 @@ Archive API endpoints for historical snapshots.
 import logging
 from datetime import date
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, select, text, tuple_
 
 from app.database import get_db
 from app.models.daily_snapshot import DailySnapshot
 from app.models.keyword import Keyword
 from app.models.user import User
-from app.api.schemas import ArchiveResponse, KeywordListItem, ErrorResponse
+from app.api.schemas import (
+    ArchiveResponse,
+    KeywordListItem,
+    ErrorResponse,
+    PageCursor,
+    ARCHIVE_RESPONSE,
+    KEYWORD_ITEM_LIST,
+    DATE_LIST,
+)
 from app.api.dependencies import get_current_user
 
 logger = logging.getLogger(__name__)
@@ -21,11 +29,17 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/archive", tags=["archive"])
 
 
-@router.get("/{snapshot_date}", response_model=ArchiveResponse)
+@router.get("/{snapshot_date}")
 async def get_archive_snapshot(
     snapshot_date: date,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    after_score: Optional[int] = Query(
+        None, description="Keyset cursor: momentum score of the last item seen"
+    ),
+    after_id: Optional[int] = Query(
+        None, description="Keyset cursor: keyword ID of the last item seen"
+    ),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -34,50 +48,95 @@ async def get_archive_snapshot(
 
     Returns all keywords with their scores for the given date.
     Requires authentication.
+
+    Prefer keyset pagination (after_score + after_id from the previous
+    response's next_cursor) over page numbers: OFFSET makes the
+    database scan and discard all preceding rows, so deep pages get
+    slower linearly, while the keyset filter is O(page_size) at any
+    depth. The page parameter is kept for backward compatibility.
     """
-    # Get all snapshots for the date, ordered by score
-    query = (
-        db.query(DailySnapshot, Keyword)
-        .join(Keyword, DailySnapshot.keyword_id == Keyword.id)
+    # Count against daily_snapshots alone: the JOIN to keywords cannot
+    # change the cardinality (keyword_id is a FK), so the count only
+    # needs the snapshot_date index, not a join-and-count round trip
+    total = (
+        db.query(func.count(DailySnapshot.id))
         .filter(DailySnapshot.snapshot_date == snapshot_date)
-        .order_by(desc(DailySnapshot.momentum_score))
+        .scalar()
     )
 
-    total = query.count()
-
     if total == 0:
         raise HTTPException(
             status_code=404, detail=f"No snapshot found for date {snapshot_date}"
         )
 
-    # Apply pagination
-    offset = (page - 1) * page_size
-    results = query.offset(offset).limit(page_size).all()
-
-    # Build response
-    keywords = []
-    for snapshot, keyword in results:
-        keywords.append(
-            KeywordListItem(
-                id=keyword.id,
-                keyword=keyword.keyword,
-                momentum_score=snapshot.momentum_score,
-                snapshot_date=snapshot.snapshot_date,
-            )
+    # Fetch just the requested page, ordered by (score, keyword) so the
+    # sort is total and a keyset cursor can resume exactly where the
+    # previous page stopped
+    # Select the response columns only: .mappings() rows go straight
+    # into KeywordListItem without ORM entity hydration
+    stmt = (
+        select(
+            Keyword.id,
+            Keyword.keyword,
+            DailySnapshot.momentum_score,
+            DailySnapshot.snapshot_date,
         )
+        .join(Keyword, DailySnapshot.keyword_id == Keyword.id)
+        .where(DailySnapshot.snapshot_date == snapshot_date)
+        .order_by(
+            desc(DailySnapshot.momentum_score), desc(DailySnapshot.keyword_id)
+        )
+    )
 
-    return ArchiveResponse(
+    if after_score is not None and after_id is not None:
+        offset = 0
+        rows = db.execute(
+            stmt.where(
+                tuple_(DailySnapshot.momentum_score, DailySnapshot.keyword_id)
+                < (after_score, after_id)
+            ).limit(page_size)
+        ).mappings().all()
+        has_next = len(rows) == page_size
+        has_prev = True
+    else:
+        offset = (page - 1) * page_size
+        rows = (
+            db.execute(stmt.offset(offset).limit(page_size)).mappings().all()
+        )
+        has_next = (offset + page_size) < total
+        has_prev = page > 1
+
+    # Build response: batch-validate the page in one pydantic-core pass
+    keywords = KEYWORD_ITEM_LIST.validate_python(rows)
+
+    next_cursor = None
+    if rows and has_next:
+        last = rows[-1]
+        next_cursor = PageCursor(
+            after_score=last["momentum_score"],
+            after_id=last["id"],
+        )
+
+    # Serialize through the pre-compiled adapter: one pass in
+    # pydantic-core instead of response_model re-validation plus a
+    # Python-level jsonable_encoder walk over every keyword
+    response = ArchiveResponse(
         date=snapshot_date,
         keywords=keywords,
         total=total,
         page=page,
         page_size=page_size,
-        has_next=(offset + page_size) < total,
-        has_prev=page > 1,
+        has_next=has_next,
+        has_prev=has_prev,
+        next_cursor=next_cursor,
+    )
+    return Response(
+        content=ARCHIVE_RESPONSE.dump_json(response),
+        media_type="application/json",
     )
 
 
-@router.get("", response_model=list[date])
+@router.get("")
 async def list_available_dates(
     limit: int = Query(30, ge=1, le=365, description="Number of dates to return"),
     db: Session = Depends(get_db),
@@ -87,12 +146,37 @@ async def list_available_dates(
 
     Returns list of dates that have snapshots, most recent first.
     """
-    dates = (
-        db.query(DailySnapshot.snapshot_date)
-        .distinct()
-        .order_by(desc(DailySnapshot.snapshot_date))
-        .limit(limit)
-        .all()
+    # Loose index scan: SELECT DISTINCT reads every row covered by the
+    # snapshot_date index, which grows by the full day's snapshot count
+    # daily. The recursive CTE instead hops from each date to the next
+    # older one with an indexed MAX() lookup per distinct date, so the
+    # query is O(distinct dates), not O(all snapshots). Works on both
+    # SQLite and Postgres. scalars() yields the date column directly,
+    # skipping per-row Row tuple construction and re-boxing.
+    dates = list(
+        db.scalars(
+            text(
+                """
+                WITH RECURSIVE dates(d) AS (
+                    SELECT MAX(snapshot_date) FROM daily_snapshots
+                    UNION ALL
+                    SELECT (
+                        SELECT MAX(snapshot_date)
+                        FROM daily_snapshots
+                        WHERE snapshot_date < d
+                    )
+                    FROM dates
+                    WHERE d IS NOT NULL
+                )
+                SELECT d FROM dates WHERE d IS NOT NULL LIMIT :limit
+                """
+            ),
+            {"limit": limit},
+        )
+    )
+    # validate_python keeps the str->date coercion the textual query
+    # needs on SQLite, where date columns come back as raw strings
+    return Response(
+        content=DATE_LIST.dump_json(DATE_LIST.validate_python(dates)),
+        media_type="application/json",
     )
-
-    return [d[0] for d in dates]
@@ -9,7 +9,7 @@ from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.services.auth_service import AuthService
+from app.services.auth_service import get_auth_service
 from app.utils.auth import get_user_id_from_token
 from app.api.schemas import ErrorResponse
 
@@ -77,7 +77,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    auth_service = AuthService()
+    auth_service = get_auth_service()
     user = auth_service.get_user_by_id(db, user_id)
 
     if not user:
@@ -100,7 +100,7 @@ async def login(
 
     Sends a magic link to the provided email address.
     """
-    auth_service = AuthService()
+    auth_service = get_auth_service()
 
     success = await auth_service.request_magic_link(
         db, request.email, request.frontend_url
@@ -127,7 +127,7 @@ async def verify(
 
     Validates the magic link token and returns a JWT access token.
     """
-    auth_service = AuthService()
+    auth_service = get_auth_service()
     result = auth_service.verify_magic_link(db, request.token)
 
     if not result:
@@ -2,18 +2,70 @@
 API dependencies for authentication and authorization.
 """
 
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
-from app.services.auth_service import AuthService
+from app.services.auth_service import get_auth_service
 from app.utils.auth import get_user_id_from_token
 
 security = HTTPBearer(auto_error=False)
 
+# Short-TTL cache of token -> User so repeated requests from the same
+# client skip the per-request DB lookup that dominates auth cost. 30s
+# keeps subscription-tier changes propagating quickly; the cache is
+# cleared wholesale if it ever grows past the cap.
+_USER_CACHE_TTL = 30.0
+_USER_CACHE_MAX = 10_000
+_user_cache: Dict[str, Tuple[float, User]] = {}
+
+
+def _cached_user(token: str) -> Optional[User]:
+    """Return the cached user for a token if the entry is still fresh."""
+    entry = _user_cache.get(token)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_user(token: str, user: User) -> None:
+    """Cache a token -> user mapping with the standard TTL."""
+    if len(_user_cache) >= _USER_CACHE_MAX:
+        _user_cache.clear()
+    _user_cache[token] = (time.monotonic() + _USER_CACHE_TTL, user)
+
+
+# Paid-status cache, keyed by user id so the Stripe webhook can
+# invalidate it directly on tier changes (tokens can't be enumerated
+# per user). A positive TTL plus explicit invalidation means upgrades
+# and downgrades both take effect immediately.
+_PAID_CACHE_TTL = 300.0
+_paid_cache: Dict[int, Tuple[float, bool]] = {}
+
+
+def _cached_paid(user_id: int) -> Optional[bool]:
+    """Return the cached paid flag for a user if still fresh."""
+    entry = _paid_cache.get(user_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_paid(user_id: int, is_paid: bool) -> None:
+    """Cache a user's paid flag."""
+    if len(_paid_cache) >= _USER_CACHE_MAX:
+        _paid_cache.clear()
+    _paid_cache[user_id] = (time.monotonic() + _PAID_CACHE_TTL, is_paid)
+
+
+def invalidate_paid_status(user_id: int) -> None:
+    """Drop a user's cached paid flag (called on subscription changes)."""
+    _paid_cache.pop(user_id, None)
+
 
 def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
@@ -33,8 +85,15 @@ def get_current_user_optional(
     if not user_id:
         return None
 
-    auth_service = AuthService()
-    return auth_service.get_user_by_id(db, user_id)
+    user = _cached_user(token)
+    if user is not None:
+        return user
+
+    auth_service = get_auth_service()
+    user = auth_service.get_user_by_id(db, user_id)
+    if user is not None:
+        _cache_user(token, user)
+    return user
 
 
 def get_current_user(
@@ -56,7 +115,11 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    auth_service = AuthService()
+    user = _cached_user(token)
+    if user is not None:
+        return user
+
+    auth_service = get_auth_service()
     user = auth_service.get_user_by_id(db, user_id)
 
     if not user:
@@ -66,6 +129,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    _cache_user(token, user)
     return user
 
 
@@ -78,9 +142,13 @@ def get_paid_user(
 
     Raises HTTPException if user is not a paid subscriber.
     """
-    auth_service = AuthService()
-    
-    if not auth_service.is_paid_user(db, user.id):
+    is_paid = _cached_paid(user.id)
+    if is_paid is None:
+        auth_service = get_auth_service()
+        is_paid = auth_service.is_paid_user(db, user.id)
+        _cache_paid(user.id, is_paid)
+
+    if not is_paid:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Paid subscription required",
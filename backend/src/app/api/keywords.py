@@ -5,13 +5,14 @@ Keywords API endpoints.
 import logging
 from datetime import date, datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, select, tuple_
 
 from app.database import get_db
 from app.models.keyword import Keyword
 from app.models.daily_snapshot import DailySnapshot
+from app.models.latest_keyword_snapshot import LatestKeywordSnapshot
 from app.models.user import User
 from app.api.schemas import (
     KeywordListResponse,
@@ -20,6 +21,11 @@ from app.api.schemas import (
     KeywordHistoryResponse,
     DailySnapshotResponse,
     ErrorResponse,
+    PageCursor,
+    KEYWORD_ITEM_LIST,
+    KEYWORD_LIST_RESPONSE,
+    KEYWORD_DETAIL_RESPONSE,
+    KEYWORD_HISTORY_RESPONSE,
 )
 from app.api.dependencies import get_current_user_optional, get_paid_user
 
@@ -28,13 +34,19 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/keywords", tags=["keywords"])
 
 
-@router.get("", response_model=KeywordListResponse)
+@router.get("")
 async def list_keywords(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
     limit: Optional[int] = Query(
         None, ge=1, le=100, description="Limit results (for free users)"
     ),
+    after_score: Optional[int] = Query(
+        None, description="Keyset cursor: momentum score of the last item seen"
+    ),
+    after_id: Optional[int] = Query(
+        None, description="Keyset cursor: keyword ID of the last item seen"
+    ),
     db: Session = Depends(get_db),
 ):
     """
@@ -42,67 +54,97 @@ async def list_keywords(
 
     For free users, use 'limit' parameter to restrict results.
     For paid users, use pagination (page, page_size).
+
+    Prefer keyset pagination (after_score + after_id from the previous
+    response's next_cursor): OFFSET scans and discards all preceding
+    rows so deep pages degrade linearly, while the keyset filter stays
+    O(page_size) at any depth. The page parameter remains for backward
+    compatibility.
     """
     # Apply limit for free users (if specified)
     if limit:
         page_size = min(page_size, limit)
 
-    # Get latest snapshot for each keyword
-    # Subquery to get the most recent snapshot date for each keyword
-    latest_snapshot_subquery = (
-        db.query(
-            DailySnapshot.keyword_id,
-            func.max(DailySnapshot.snapshot_date).label("max_date"),
+    # Read the latest snapshots from the pipeline-maintained cache
+    # table: O(keywords) indexed rows instead of a groupwise-max over
+    # all of daily_snapshots on every request
+    # The (score, keyword_id) tie-break makes the sort total, so a
+    # keyset cursor resumes exactly where the previous page stopped
+    # Select the four response columns rather than ORM entities: the
+    # rows skip identity-map hydration and feed KeywordListItem
+    # straight from .mappings()
+    stmt = (
+        select(
+            Keyword.id,
+            Keyword.keyword,
+            LatestKeywordSnapshot.momentum_score,
+            LatestKeywordSnapshot.snapshot_date,
         )
-        .group_by(DailySnapshot.keyword_id)
-        .subquery()
-    )
-
-    # Join keywords with their latest snapshots
-    query = (
-        db.query(Keyword, DailySnapshot)
         .join(
-            latest_snapshot_subquery,
-            Keyword.id == latest_snapshot_subquery.c.keyword_id,
+            LatestKeywordSnapshot,
+            LatestKeywordSnapshot.keyword_id == Keyword.id,
         )
-        .join(
-            DailySnapshot,
-            (DailySnapshot.keyword_id == Keyword.id)
-            & (DailySnapshot.snapshot_date == latest_snapshot_subquery.c.max_date),
+        .order_by(
+            desc(LatestKeywordSnapshot.momentum_score),
+            desc(LatestKeywordSnapshot.keyword_id),
         )
-        .order_by(desc(DailySnapshot.momentum_score))
     )
 
-    # Get total count
-    total = query.count()
-
-    # Apply pagination
-    offset = (page - 1) * page_size
-    results = query.offset(offset).limit(page_size).all()
-
-    # Build response
-    items = []
-    for keyword, snapshot in results:
-        items.append(
-            KeywordListItem(
-                id=keyword.id,
-                keyword=keyword.keyword,
-                momentum_score=snapshot.momentum_score,
-                snapshot_date=snapshot.snapshot_date,
-            )
+    # The join cannot change cardinality (keyword_id is a FK), so the
+    # count only needs the cache table
+    total = db.scalar(select(func.count()).select_from(LatestKeywordSnapshot))
+
+    if after_score is not None and after_id is not None:
+        offset = 0
+        rows = db.execute(
+            stmt.where(
+                tuple_(
+                    LatestKeywordSnapshot.momentum_score,
+                    LatestKeywordSnapshot.keyword_id,
+                )
+                < (after_score, after_id)
+            ).limit(page_size)
+        ).mappings().all()
+        has_next = len(rows) == page_size
+        has_prev = True
+    else:
+        offset = (page - 1) * page_size
+        rows = (
+            db.execute(stmt.offset(offset).limit(page_size)).mappings().all()
+        )
+        has_next = (offset + page_size) < total
+        has_prev = page > 1
+
+    # Build response: batch-validate the page in one pydantic-core pass
+    items = KEYWORD_ITEM_LIST.validate_python(rows)
+
+    next_cursor = None
+    if rows and has_next:
+        last = rows[-1]
+        next_cursor = PageCursor(
+            after_score=last["momentum_score"],
+            after_id=last["id"],
         )
 
-    return KeywordListResponse(
+    # Serialize through the pre-compiled adapter: one pass in
+    # pydantic-core instead of response_model re-validation plus a
+    # Python-level jsonable_encoder walk over every item
+    response = KeywordListResponse(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
-        has_next=(offset + page_size) < total,
-        has_prev=page > 1,
+        has_next=has_next,
+        has_prev=has_prev,
+        next_cursor=next_cursor,
+    )
+    return Response(
+        content=KEYWORD_LIST_RESPONSE.dump_json(response),
+        media_type="application/json",
     )
 
 
-@router.get("/full", response_model=KeywordListResponse)
+@router.get("/full")
 async def list_all_keywords(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
@@ -115,46 +157,30 @@ async def list_all_keywords(
     This endpoint provides full access without limits.
     Requires paid subscription.
     """
-    # Get all keywords with latest snapshots
-    latest_snapshot_subquery = (
-        db.query(
-            DailySnapshot.keyword_id,
-            func.max(DailySnapshot.snapshot_date).label("max_date"),
-        )
-        .group_by(DailySnapshot.keyword_id)
-        .subquery()
-    )
-
-    query = (
-        db.query(Keyword, DailySnapshot)
-        .outerjoin(
-            latest_snapshot_subquery,
-            Keyword.id == latest_snapshot_subquery.c.keyword_id,
+    # All keywords with their cached latest snapshots; the outer join
+    # keeps keywords that have no snapshot yet (NULL score/date), and
+    # the column select skips ORM entity hydration
+    stmt = (
+        select(
+            Keyword.id,
+            Keyword.keyword,
+            LatestKeywordSnapshot.momentum_score,
+            LatestKeywordSnapshot.snapshot_date,
         )
         .outerjoin(
-            DailySnapshot,
-            (DailySnapshot.keyword_id == Keyword.id)
-            & (DailySnapshot.snapshot_date == latest_snapshot_subquery.c.max_date),
+            LatestKeywordSnapshot,
+            LatestKeywordSnapshot.keyword_id == Keyword.id,
         )
-        .order_by(desc(DailySnapshot.momentum_score))
+        .order_by(desc(LatestKeywordSnapshot.momentum_score))
     )
 
-    total = query.count()
+    total = db.scalar(select(func.count()).select_from(Keyword))
     offset = (page - 1) * page_size
-    results = query.offset(offset).limit(page_size).all()
-
-    items = []
-    for keyword, snapshot in results:
-        items.append(
-            KeywordListItem(
-                id=keyword.id,
-                keyword=keyword.keyword,
-                momentum_score=snapshot.momentum_score if snapshot else None,
-                snapshot_date=snapshot.snapshot_date if snapshot else None,
-            )
-        )
+    rows = db.execute(stmt.offset(offset).limit(page_size)).mappings().all()
+
+    items = KEYWORD_ITEM_LIST.validate_python(rows)
 
-    return KeywordListResponse(
+    response = KeywordListResponse(
         items=items,
         total=total,
         page=page,
@@ -162,9 +188,13 @@ async def list_all_keywords(
         has_next=(offset + page_size) < total,
         has_prev=page > 1,
     )
+    return Response(
+        content=KEYWORD_LIST_RESPONSE.dump_json(response),
+        media_type="application/json",
+    )
 
 
-@router.get("/{keyword_id}", response_model=KeywordDetailResponse)
+@router.get("/{keyword_id}")
 async def get_keyword(
     keyword_id: int,
     db: Session = Depends(get_db),
@@ -185,7 +215,7 @@ async def get_keyword(
         .first()
     )
 
-    return KeywordDetailResponse(
+    response = KeywordDetailResponse(
         id=keyword.id,
         keyword=keyword.keyword,
         created_at=keyword.created_at,
@@ -196,9 +226,13 @@ async def get_keyword(
             else None
         ),
     )
+    return Response(
+        content=KEYWORD_DETAIL_RESPONSE.dump_json(response),
+        media_type="application/json",
+    )
 
 
-@router.get("/{keyword_id}/history", response_model=KeywordHistoryResponse)
+@router.get("/{keyword_id}/history")
 async def get_keyword_history(
     keyword_id: int,
     limit: Optional[int] = Query(
@@ -226,9 +260,13 @@ async def get_keyword_history(
 
     snapshots = query.all()
 
-    return KeywordHistoryResponse(
+    response = KeywordHistoryResponse(
         keyword_id=keyword.id,
         keyword=keyword.keyword,
         history=[DailySnapshotResponse.model_validate(s) for s in snapshots],
         total=len(snapshots),
     )
+    return Response(
+        content=KEYWORD_HISTORY_RESPONSE.dump_json(response),
+        media_type="application/json",
+    )
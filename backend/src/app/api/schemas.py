@@ -4,7 +4,18 @@ Pydantic schemas for API request/response models.
 
 from datetime import date, datetime
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+# Shared config for response models. frozen + revalidate_instances
+# "never" let pydantic-core skip the per-instance revalidation and
+# copy-on-validate work when models nest inside each other; extra
+# "forbid" keeps accidental columns from leaking into responses.
+_RESPONSE_CONFIG = ConfigDict(
+    from_attributes=True,
+    extra="forbid",
+    frozen=True,
+    revalidate_instances="never",
+)
 
 
 class KeywordBase(BaseModel):
@@ -16,13 +27,12 @@ class KeywordBase(BaseModel):
 class KeywordResponse(KeywordBase):
     """Keyword response schema."""
 
+    model_config = _RESPONSE_CONFIG
+
     id: int
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class ScoreMetrics(BaseModel):
     """Score metrics breakdown."""
@@ -40,6 +50,8 @@ class ScoreMetrics(BaseModel):
 class DailySnapshotResponse(BaseModel):
     """Daily snapshot response schema."""
 
+    model_config = _RESPONSE_CONFIG
+
     id: int
     keyword_id: int
     snapshot_date: date
@@ -51,9 +63,6 @@ class DailySnapshotResponse(BaseModel):
     noise_value: float
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class KeywordDetailResponse(KeywordResponse):
     """Keyword detail response with latest snapshot."""
@@ -64,29 +73,47 @@ class KeywordDetailResponse(KeywordResponse):
 class KeywordListItem(BaseModel):
     """Keyword list item with score."""
 
+    model_config = _RESPONSE_CONFIG
+
     id: int
     keyword: str
     momentum_score: Optional[int] = None
     snapshot_date: Optional[date] = None
 
-    class Config:
-        from_attributes = True
+
+class PageCursor(BaseModel):
+    """
+    Keyset pagination cursor.
+
+    Echo these values back as the after_score/after_id query parameters
+    to fetch the next page without OFFSET's linear scan-and-discard.
+    """
+
+    model_config = _RESPONSE_CONFIG
+
+    after_score: int
+    after_id: int
 
 
 class KeywordListResponse(BaseModel):
     """Paginated keyword list response."""
 
+    model_config = _RESPONSE_CONFIG
+
     items: List[KeywordListItem]
     total: int
     page: int
     page_size: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[PageCursor] = None
 
 
 class KeywordHistoryResponse(BaseModel):
     """Keyword score history response."""
 
+    model_config = _RESPONSE_CONFIG
+
     keyword_id: int
     keyword: str
     history: List[DailySnapshotResponse]
@@ -96,6 +123,8 @@ class KeywordHistoryResponse(BaseModel):
 class ArchiveResponse(BaseModel):
     """Archive snapshot response."""
 
+    model_config = _RESPONSE_CONFIG
+
     date: date
     keywords: List[KeywordListItem]
     total: int
@@ -103,6 +132,7 @@ class ArchiveResponse(BaseModel):
     page_size: int = 50
     has_next: bool = False
     has_prev: bool = False
+    next_cursor: Optional[PageCursor] = None
 
 
 class ErrorResponse(BaseModel):
@@ -110,3 +140,21 @@ class ErrorResponse(BaseModel):
 
     error: str
     detail: Optional[str] = None
+
+
+# Pre-built serializers, one per response schema. Each TypeAdapter
+# compiles its pydantic-core serializer once at import time; dump_json
+# then encodes the whole response in a single Rust-side pass instead of
+# FastAPI re-validating via response_model and walking the object
+# field-by-field with jsonable_encoder on every request.
+# List adapter for batch-validating result rows: one pydantic-core
+# pass over the whole page instead of a Python loop constructing items
+# one by one. The frozen/never-revalidate item config means the
+# response-level dump below reuses these instances as-is.
+KEYWORD_ITEM_LIST = TypeAdapter(List[KeywordListItem])
+
+KEYWORD_LIST_RESPONSE = TypeAdapter(KeywordListResponse)
+KEYWORD_DETAIL_RESPONSE = TypeAdapter(KeywordDetailResponse)
+KEYWORD_HISTORY_RESPONSE = TypeAdapter(KeywordHistoryResponse)
+ARCHIVE_RESPONSE = TypeAdapter(ArchiveResponse)
+DATE_LIST = TypeAdapter(List[date])
@@ -2,26 +2,113 @@
 Stripe API endpoints for subscription management.
 """
 
+import asyncio
 import logging
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
+import fastjsonschema
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 import stripe
 
 from app.database import get_db
 from app.models.user import User, SubscriptionTier
 from app.models.subscription import Subscription, SubscriptionStatus
-from app.api.dependencies import get_current_user
+from app.models.processed_webhook_event import ProcessedWebhookEvent
+from app.api.dependencies import get_current_user, invalidate_paid_status
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/stripe", tags=["stripe"])
 
+# Bind the Stripe settings once at import: pydantic-settings attribute
+# access goes through model machinery, which is wasted work on every
+# request for values that never change after startup
+_STRIPE_SECRET_KEY = settings.stripe_secret_key
+_STRIPE_WEBHOOK_SECRET = settings.stripe_webhook_secret
+_STRIPE_PRICE_ID = settings.stripe_price_id
+
 # Initialize Stripe
-if settings.stripe_secret_key:
-    stripe.api_key = settings.stripe_secret_key
+if _STRIPE_SECRET_KEY:
+    stripe.api_key = _STRIPE_SECRET_KEY
+
+# Stripe sends lowercase status strings; keying on them directly saves
+# rebuilding the dict and upper-casing the status on every webhook
+_STRIPE_STATUS_MAP = {
+    "active": SubscriptionStatus.ACTIVE,
+    "canceled": SubscriptionStatus.CANCELED,
+    "past_due": SubscriptionStatus.PAST_DUE,
+    "unpaid": SubscriptionStatus.UNPAID,
+    "trialing": SubscriptionStatus.TRIALING,
+    "incomplete": SubscriptionStatus.INCOMPLETE,
+    "incomplete_expired": SubscriptionStatus.INCOMPLETE_EXPIRED,
+}
+
+# Short-lived per-user cache for the status endpoint, which the
+# frontend polls. 30s staleness is acceptable because the webhook
+# handler invalidates the affected user on every subscription change,
+# so real transitions still show up immediately. Mirrors the token
+# cache in api/dependencies.py.
+# Stripe events are a few KB; anything past this is not a legitimate
+# webhook and gets rejected before it is fully buffered
+_MAX_WEBHOOK_BODY = 262_144
+
+# Compiled once at import: construct_event verifies the HMAC but not
+# the JSON shape, so a signed-but-malformed event is failed fast here
+# with one generated-code pass over just the fields the handler reads
+_VALIDATE_EVENT = fastjsonschema.compile(
+    {
+        "type": "object",
+        "required": ["id", "type", "data"],
+        "properties": {
+            "id": {"type": "string"},
+            "type": {"type": "string"},
+            "data": {
+                "type": "object",
+                "required": ["object"],
+                "properties": {
+                    "object": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "string"},
+                            "status": {"type": "string"},
+                            "customer": {"type": ["string", "null"]},
+                            "subscription": {"type": ["string", "null"]},
+                            "current_period_end": {"type": ["integer", "null"]},
+                            "metadata": {
+                                "type": "object",
+                                "properties": {"user_id": {"type": "string"}},
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    }
+)
+
+_STATUS_CACHE_TTL = 30.0
+_STATUS_CACHE_MAX = 10_000
+_status_cache: Dict[int, Tuple[float, dict]] = {}
+
+
+def _cached_status(user_id: int) -> Optional[dict]:
+    """Return the cached status payload if present and fresh."""
+    entry = _status_cache.get(user_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_status(user_id: int, payload: dict) -> None:
+    """Cache a status payload, clearing wholesale past the size cap."""
+    if len(_status_cache) >= _STATUS_CACHE_MAX:
+        _status_cache.clear()
+    _status_cache[user_id] = (time.monotonic() + _STATUS_CACHE_TTL, payload)
 
 
 class CreateCheckoutRequest(BaseModel):
@@ -49,7 +136,7 @@ async def create_checkout(
 
     Requires authentication.
     """
-    if not settings.stripe_secret_key or not settings.stripe_price_id:
+    if not _STRIPE_SECRET_KEY or not _STRIPE_PRICE_ID:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Stripe not configured",
@@ -73,7 +160,7 @@ async def create_checkout(
             payment_method_types=["card"],
             line_items=[
                 {
-                    "price": settings.stripe_price_id,
+                    "price": _STRIPE_PRICE_ID,
                     "quantity": 1,
                 }
             ],
@@ -107,19 +194,29 @@ async def stripe_webhook(
     Processes subscription events (created, updated, deleted, etc.)
     Note: This endpoint should be configured in Stripe dashboard with the webhook secret.
     """
-    if not settings.stripe_webhook_secret:
+    if not _STRIPE_WEBHOOK_SECRET:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Stripe webhook secret not configured",
         )
 
-    # Get raw body for signature verification
-    body = await request.body()
+    # Stream the raw body for signature verification, enforcing the
+    # size cap chunk by chunk so an oversized payload is dropped as
+    # soon as it crosses the limit instead of being buffered whole
+    buf = bytearray()
+    async for chunk in request.stream():
+        buf.extend(chunk)
+        if len(buf) > _MAX_WEBHOOK_BODY:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Payload too large",
+            )
+    body = bytes(buf)
     sig_header = request.headers.get("stripe-signature")
 
     try:
         event = stripe.Webhook.construct_event(
-            body, sig_header, settings.stripe_webhook_secret
+            body, sig_header, _STRIPE_WEBHOOK_SECRET
         )
     except ValueError as e:
         logger.error(f"Invalid payload: {e}")
@@ -128,6 +225,26 @@ async def stripe_webhook(
         logger.error(f"Invalid signature: {e}")
         raise HTTPException(status_code=400, detail="Invalid signature")
 
+    try:
+        _VALIDATE_EVENT(event)
+    except fastjsonschema.JsonSchemaException as e:
+        logger.error(f"Malformed Stripe event payload: {e}")
+        raise HTTPException(status_code=400, detail="Malformed event payload")
+
+    # Stripe delivers at-least-once: claim the event ID before doing
+    # any work, in the same transaction as the updates below, so a
+    # retried delivery returns 200 immediately instead of re-running
+    # the handler (and tripping the unique subscription constraint)
+    try:
+        db.execute(
+            insert(ProcessedWebhookEvent).values(event_id=event["id"])
+        )
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        logger.info(f"Skipping already-processed Stripe event {event['id']}")
+        return {"status": "success"}
+
     # Handle event
     event_type = event["type"]
     data = event["data"]["object"]
@@ -142,20 +259,34 @@ async def stripe_webhook(
             user_id = data.get("metadata", {}).get("user_id")
 
             if user_id and subscription_id:
-                user = db.query(User).filter(User.id == int(user_id)).first()
-                if user:
+                # Start the Stripe round trip in a worker thread (the
+                # SDK call is blocking) and overlap it with our own DB
+                # fetch instead of serializing the two
+                retrieve_task = asyncio.create_task(
+                    asyncio.to_thread(stripe.Subscription.retrieve, subscription_id)
+                )
+
+                # One joined fetch for the user and any existing
+                # subscription record, instead of two round trips
+                row = db.execute(
+                    select(User, Subscription)
+                    .outerjoin(
+                        Subscription,
+                        Subscription.stripe_subscription_id == subscription_id,
+                    )
+                    .where(User.id == int(user_id))
+                ).first()
+
+                if row is None:
+                    await retrieve_task
+                else:
+                    user, db_subscription = row
+
                     # Update user subscription tier
                     user.subscription_tier = SubscriptionTier.PAID
 
                     # Get subscription details from Stripe
-                    subscription = stripe.Subscription.retrieve(subscription_id)
-
-                    # Create or update subscription record
-                    db_subscription = (
-                        db.query(Subscription)
-                        .filter(Subscription.stripe_subscription_id == subscription_id)
-                        .first()
-                    )
+                    subscription = await retrieve_task
 
                     if not db_subscription:
                         db_subscription = Subscription(
@@ -172,6 +303,8 @@ async def stripe_webhook(
                         )
 
                     db.commit()
+                    _status_cache.pop(user.id, None)
+                    invalidate_paid_status(user.id)
                     logger.info(f"Subscription activated for user {user_id}")
 
         elif event_type in [
@@ -180,42 +313,36 @@ async def stripe_webhook(
         ]:
             # Subscription updated or deleted
             subscription_id = data.get("id")
-            status_str = data.get("status", "").upper()
-
-            db_subscription = (
-                db.query(Subscription)
-                .filter(Subscription.stripe_subscription_id == subscription_id)
-                .first()
+            status_str = data.get("status", "")
+            new_status = _STRIPE_STATUS_MAP.get(
+                status_str, SubscriptionStatus.INCOMPLETE
             )
 
-            if db_subscription:
-                # Map Stripe status to our status
-                status_map = {
-                    "ACTIVE": SubscriptionStatus.ACTIVE,
-                    "CANCELED": SubscriptionStatus.CANCELED,
-                    "PAST_DUE": SubscriptionStatus.PAST_DUE,
-                    "UNPAID": SubscriptionStatus.UNPAID,
-                    "TRIALING": SubscriptionStatus.TRIALING,
-                    "INCOMPLETE": SubscriptionStatus.INCOMPLETE,
-                    "INCOMPLETE_EXPIRED": SubscriptionStatus.INCOMPLETE_EXPIRED,
-                }
-
-                db_subscription.status = status_map.get(
-                    status_str, SubscriptionStatus.INCOMPLETE
+            # One UPDATE ... RETURNING instead of SELECT, ORM mutation,
+            # and a second SELECT for the user: at most two statements,
+            # no entity hydration
+            row = db.execute(
+                update(Subscription)
+                .where(Subscription.stripe_subscription_id == subscription_id)
+                .values(
+                    status=new_status,
+                    current_period_end=data.get("current_period_end"),
                 )
-                db_subscription.current_period_end = data.get("current_period_end")
-
-                # Update user tier if subscription is not active
-                if db_subscription.status != SubscriptionStatus.ACTIVE:
-                    user = (
-                        db.query(User)
-                        .filter(User.id == db_subscription.user_id)
-                        .first()
+                .returning(Subscription.user_id)
+            ).first()
+
+            if row:
+                # Downgrade the user tier if the subscription left active
+                if new_status != SubscriptionStatus.ACTIVE:
+                    db.execute(
+                        update(User)
+                        .where(User.id == row.user_id)
+                        .values(subscription_tier=SubscriptionTier.FREE)
                     )
-                    if user:
-                        user.subscription_tier = SubscriptionTier.FREE
 
                 db.commit()
+                _status_cache.pop(row.user_id, None)
+                invalidate_paid_status(row.user_id)
                 logger.info(f"Subscription {subscription_id} updated to {status_str}")
 
     except Exception as e:
@@ -226,6 +353,10 @@ async def stripe_webhook(
             detail="Error processing webhook",
         )
 
+    # Persist the claim for event types the branches above didn't
+    # commit (a no-op when they did); the error path rolled it back so
+    # Stripe's retry gets a clean attempt
+    db.commit()
     return {"status": "success"}
 
 
@@ -239,14 +370,20 @@ async def get_subscription_status(
 
     Requires authentication.
     """
-    subscription = (
-        db.query(Subscription)
-        .filter(Subscription.user_id == user.id)
+    cached = _cached_status(user.id)
+    if cached is not None:
+        return cached
+
+    # Only the two reported columns: skips hydrating a full
+    # Subscription ORM instance per poll
+    subscription = db.execute(
+        select(Subscription.status, Subscription.current_period_end)
+        .where(Subscription.user_id == user.id)
         .order_by(Subscription.created_at.desc())
-        .first()
-    )
+        .limit(1)
+    ).first()
 
-    return {
+    payload = {
         "subscription_tier": user.subscription_tier.value,
         "has_active_subscription": (
             subscription is not None
@@ -254,10 +391,11 @@ async def get_subscription_status(
         ),
         "subscription": (
             {
-                "status": subscription.status.value if subscription else None,
+                # status is already the lowercase Stripe string
+                "status": subscription.status,
                 "current_period_end": (
                     subscription.current_period_end.isoformat()
-                    if subscription and subscription.current_period_end
+                    if subscription.current_period_end
                     else None
                 ),
             }
@@ -265,3 +403,5 @@ async def get_subscription_status(
             else None
         ),
     }
+    _cache_status(user.id, payload)
+    return payload
@@ -14,6 +14,22 @@ class Settings(BaseSettings):
     # For Production: Use PostgreSQL (postgresql://...)
     database_url: str = "sqlite:///./data.db"
 
+    # Database connection pool (PostgreSQL only). One-shot cron scripts
+    # set db_use_null_pool=true so they don't hold idle pooled
+    # connections after their queries finish; the API keeps a warm pool.
+    # Sized for API traffic plus the pipeline fan-out: each of the
+    # pipeline_concurrency scoring workers holds its own session, and
+    # the scheduler's executor threads compete for the same pool.
+    db_pool_size: int = 20
+    db_max_overflow: int = 20
+    db_pool_recycle_seconds: int = 1800
+    db_use_null_pool: bool = False
+
+    # Daily pipeline: how many keywords are scored concurrently. The
+    # work is dominated by Google Trends round trips, so modest
+    # fan-out cuts wall-clock roughly linearly until rate limits bite.
+    pipeline_concurrency: int = 10
+
     # Security
     secret_key: str
     algorithm: str = "HS256"
@@ -41,6 +57,11 @@ class Settings(BaseSettings):
     # Public pages directory
     public_pages_dir: str = "./public_generated"
 
+    # Build public pages in-process from the pipeline (avoids paying
+    # interpreter startup + app re-import for a subprocess); set false
+    # to fall back to the old isolated subprocess build
+    build_pages_in_process: bool = True
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -4,6 +4,7 @@ FastAPI application entry point.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
 from app.utils.logging import setup_logging
@@ -17,40 +18,46 @@ app = FastAPI(
     description="API for tracking TikTok keyword momentum",
     version="0.1.0",
     debug=settings.debug,
+    # orjson encodes dict responses (health checks, subscription
+    # status, webhook acks) in C instead of stdlib json; endpoints that
+    # already return raw Response bytes are unaffected
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
 # In production, restrict to actual domain
 # In development, allow localhost
-allowed_origins = []
+# Computed once at import into an immutable tuple: the middleware
+# checks the Origin header against this collection on every request,
+# so it should never be rebuilt per request or hold duplicates.
 if settings.debug:
     # Development: allow localhost
-    allowed_origins = [
+    ALLOWED_ORIGINS = (
         "http://localhost:3000",
         "http://127.0.0.1:3000",
-    ]
+    )
 else:
-    # Production: restrict to domain
-    allowed_origins = [
-        "https://trendearly.xyz",
-        "https://www.trendearly.xyz",
-        # Also allow frontend_url if set (for magic links)
-        settings.frontend_url,
-    ]
-    # Remove duplicates and filter out localhost in production
-    allowed_origins = [
+    # Production: restrict to domain, dedupe, and filter out localhost
+    # (frontend_url is included for magic links when set)
+    ALLOWED_ORIGINS = tuple(
         origin
-        for origin in set(allowed_origins)
+        for origin in {
+            "https://trendearly.xyz",
+            "https://www.trendearly.xyz",
+            settings.frontend_url,
+        }
         if origin and not origin.startswith("http://localhost")
-    ]
+    )
 
+# expose_headers=["*"] was dropped: it added an
+# Access-Control-Expose-Headers header to every response and the
+# frontend only reads the body of our JSON responses
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=allowed_origins,
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["*"],
 )
 
 # Include API routers
@@ -1,23 +1,51 @@
 """
 Database models package.
+
+Model classes are resolved lazily (PEP 562): `from app.models import X`
+only constructs X's table (Column objects, enum CHECK constraints, the
+ZstdJSON codec) on first access, so scripts that touch one or two
+models don't pay for the whole metadata graph at import. Base and
+BaseModel stay eager; call load_all() before metadata-wide operations
+like create_all.
+
+Modules that name relationship targets as strings import those target
+modules themselves, so any entry point into the graph registers every
+class configure_mappers() will need.
 """
 
+import importlib
+
 from app.models.base import Base, BaseModel
-from app.models.keyword import Keyword, KeywordType
-from app.models.daily_snapshot import DailySnapshot
-from app.models.google_trends_cache import GoogleTrendsCache
-from app.models.user import User, SubscriptionTier
-from app.models.subscription import Subscription, SubscriptionStatus
-
-__all__ = [
-    "Base",
-    "BaseModel",
-    "Keyword",
-    "KeywordType",
-    "DailySnapshot",
-    "GoogleTrendsCache",
-    "User",
-    "SubscriptionTier",
-    "Subscription",
-    "SubscriptionStatus",
-]
+
+_LAZY = {
+    "Keyword": "app.models.keyword",
+    "KeywordType": "app.models.keyword",
+    "DailySnapshot": "app.models.daily_snapshot",
+    "LatestKeywordSnapshot": "app.models.latest_keyword_snapshot",
+    "GoogleTrendsCache": "app.models.google_trends_cache",
+    "User": "app.models.user",
+    "SubscriptionTier": "app.models.user",
+    "Subscription": "app.models.subscription",
+    "SubscriptionStatus": "app.models.subscription",
+    "ProcessedWebhookEvent": "app.models.processed_webhook_event",
+}
+
+__all__ = ["Base", "BaseModel", *_LAZY]
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def load_all():
+    """Import every model module so Base.metadata is complete."""
+    for name in _LAZY:
+        __getattr__(name)
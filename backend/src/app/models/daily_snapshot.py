@@ -4,6 +4,7 @@ Daily snapshot model for storing keyword momentum scores.
 
 from datetime import date
 from sqlalchemy import Column, Integer, ForeignKey, Date, Float, JSON, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -26,8 +27,9 @@ class DailySnapshot(BaseModel):
     novelty_value = Column(Float, nullable=False)
     noise_value = Column(Float, nullable=False)
     
-    # Google Trends data (stored as JSON)
-    google_trends_data = Column(JSON, nullable=True)
+    # Google Trends data (stored as JSON; JSONB on Postgres for binary
+    # storage and indexable containment queries)
+    google_trends_data = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
     
     # Relationship to keyword
     keyword = relationship("Keyword", back_populates="snapshots")
@@ -40,3 +42,7 @@ class DailySnapshot(BaseModel):
     def __repr__(self):
         return f"<DailySnapshot(id={self.id}, keyword_id={self.keyword_id}, date={self.snapshot_date}, score={self.momentum_score})>"
 
+
+# Resolve the string relationship target above for configure_mappers()
+from app.models import keyword  # noqa: E402,F401
+
@@ -2,19 +2,19 @@
 Google Trends cache model for storing time series data.
 """
 
-from datetime import datetime
 from sqlalchemy import (
     Column,
     Integer,
     ForeignKey,
     String,
-    JSON,
     DateTime,
     UniqueConstraint,
     Index,
+    func,
 )
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
+from app.models.types import ZstdJSON
 
 
 class GoogleTrendsCache(BaseModel):
@@ -34,12 +34,19 @@ class GoogleTrendsCache(BaseModel):
     )  # Geographic location (empty = worldwide)
     timeframe = Column(String(50), default="today 12-m", nullable=False)  # Time range
 
-    # Time series data stored as JSON
+    # Time series data stored as zstd-compressed JSON (transparent to callers)
     # Format: {"data": [{"date": "2024-01-01", "value": 50}, ...], "fetched_at": "..."}
-    time_series_data = Column(JSON, nullable=False)
+    time_series_data = Column(ZstdJSON, nullable=False)
+    time_series_encoding = Column(
+        String(10), default="zstd+json", server_default="zstd+json", nullable=False
+    )
 
-    # Metadata
-    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Metadata. server_default lets the database stamp the timestamp,
+    # so bulk INSERTs of many rows don't need per-row Python default
+    # execution (SQLite emits CURRENT_TIMESTAMP, Postgres now())
+    fetched_at = Column(
+        DateTime, server_default=func.now(), nullable=False, index=True
+    )
 
     # Relationship to keyword
     keyword = relationship("Keyword", back_populates="trends_cache")
@@ -54,3 +61,7 @@ class GoogleTrendsCache(BaseModel):
 
     def __repr__(self):
         return f"<GoogleTrendsCache(id={self.id}, keyword_id={self.keyword_id}, geo='{self.geo}', timeframe='{self.timeframe}')>"
+
+
+# Resolve the string relationship target above for configure_mappers()
+from app.models import keyword  # noqa: E402,F401
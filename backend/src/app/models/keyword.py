@@ -29,21 +29,30 @@ class Keyword(BaseModel):
     first_seen = Column(Date, nullable=True, index=True)
     last_seen = Column(Date, nullable=True, index=True)
 
-    # Relationship to daily snapshots
+    # Relationship to daily snapshots. lazy="raise" forbids implicit
+    # per-row loads (the old lazy="dynamic" issued a fresh Query per
+    # access); readers either query DailySnapshot directly, as all
+    # current call sites do, or opt in with selectinload to batch.
     snapshots = relationship(
         "DailySnapshot",
         back_populates="keyword",
         cascade="all, delete-orphan",
-        lazy="dynamic",
+        lazy="raise",
     )
 
-    # Relationship to Google Trends cache
+    # Relationship to Google Trends cache (same loading contract)
     trends_cache = relationship(
         "GoogleTrendsCache",
         back_populates="keyword",
         cascade="all, delete-orphan",
-        lazy="dynamic",
+        lazy="raise",
     )
 
     def __repr__(self):
         return f"<Keyword(id={self.id}, keyword='{self.keyword}', type={self.keyword_type.value})>"
+
+
+# The relationship targets above are named as strings; import their
+# modules so importing this one is enough for configure_mappers() to
+# resolve them, whatever subset of models a caller pulls in
+from app.models import daily_snapshot, google_trends_cache  # noqa: E402,F401
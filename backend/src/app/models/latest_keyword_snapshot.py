@@ -0,0 +1,32 @@
+"""
+Latest keyword snapshot cache model.
+"""
+
+from sqlalchemy import Column, Integer, ForeignKey, Date
+from app.models.base import Base
+
+
+class LatestKeywordSnapshot(Base):
+    """
+    Per-keyword cache of the newest daily snapshot.
+
+    The list endpoints need only each keyword's most recent snapshot,
+    which changes once per day when the pipeline runs. Rather than
+    recompute a groupwise-max over all of daily_snapshots on every API
+    call, the pipeline rewrites this table at the end of each run and
+    the endpoints do an O(keywords) indexed read.
+    """
+
+    __tablename__ = "latest_keyword_snapshot"
+
+    keyword_id = Column(
+        Integer, ForeignKey("keywords.id"), primary_key=True, autoincrement=False
+    )
+    snapshot_date = Column(Date, nullable=False)
+    momentum_score = Column(Integer, nullable=False, index=True)
+
+    def __repr__(self):
+        return (
+            f"<LatestKeywordSnapshot(keyword_id={self.keyword_id}, "
+            f"date={self.snapshot_date}, score={self.momentum_score})>"
+        )
@@ -0,0 +1,26 @@
+"""
+Processed webhook event ledger for idempotent Stripe event handling.
+"""
+
+from sqlalchemy import Column, DateTime, String, func
+
+from app.models.base import Base
+
+
+class ProcessedWebhookEvent(Base):
+    """Stripe event IDs that have already been handled.
+
+    Stripe delivers webhooks at-least-once; the handler claims the
+    event ID here before doing any work, so retries short-circuit
+    instead of re-running the subscription updates. The Stripe event ID
+    is the natural primary key, so this does not extend BaseModel's
+    surrogate id/created_at/updated_at columns.
+    """
+
+    __tablename__ = "processed_webhook_events"
+
+    event_id = Column(String(255), primary_key=True)
+    processed_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ProcessedWebhookEvent(event_id={self.event_id})>"
@@ -3,7 +3,7 @@ Subscription model for Stripe subscription management.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Index
 from sqlalchemy.orm import relationship
 import enum
 from app.models.base import BaseModel
@@ -27,16 +27,34 @@ class Subscription(BaseModel):
     
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     stripe_subscription_id = Column(String(255), unique=True, nullable=False, index=True)
+    # Plain string, not SQLEnum: values are the lowercase Stripe status
+    # strings (SubscriptionStatus members compare equal to them). This
+    # skips the per-row Python enum coercion on reads, avoids the
+    # Postgres custom type / SQLite CHECK constraint, and is indexed
+    # because the hot auth path filters on it.
     status = Column(
-        SQLEnum(SubscriptionStatus),
+        String(32),
         nullable=False,
-        default=SubscriptionStatus.INCOMPLETE
+        default=SubscriptionStatus.INCOMPLETE.value,
+        index=True,
     )
     current_period_end = Column(DateTime, nullable=True)
     
     # Relationship to user
     user = relationship("User", back_populates="subscriptions")
-    
+
+    # The status endpoint fetches the newest subscription per user
+    # (WHERE user_id ORDER BY created_at DESC LIMIT 1); the composite
+    # index answers that with a single index descent instead of
+    # scanning all of a user's rows and sorting
+    __table_args__ = (
+        Index("ix_subscription_user_created", "user_id", "created_at"),
+    )
+
     def __repr__(self):
-        return f"<Subscription(id={self.id}, user_id={self.user_id}, status={self.status.value})>"
+        return f"<Subscription(id={self.id}, user_id={self.user_id}, status={self.status})>"
+
+
+# Resolve the string relationship target above for configure_mappers()
+from app.models import user  # noqa: E402,F401
 
@@ -0,0 +1,33 @@
+"""
+Custom SQLAlchemy column types.
+"""
+
+import orjson
+import zstandard
+from sqlalchemy.types import TypeDecorator, LargeBinary
+
+
+class ZstdJSON(TypeDecorator):
+    """
+    JSON stored as a zstd-compressed BLOB.
+
+    Trend time series are highly redundant (repeated date strings, small
+    ints), so compression cuts row size 5-10x. Smaller rows mean fewer
+    page reads when scanning the cache table and a smaller WAL during
+    refreshes. Values are plain Python dicts/lists on both sides; the
+    compression is invisible to callers.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        # orjson emits compact bytes directly (no separators/encode step)
+        return zstandard.ZstdCompressor(level=3).compress(orjson.dumps(value))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return orjson.loads(zstandard.ZstdDecompressor().decompress(value))
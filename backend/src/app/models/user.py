@@ -27,14 +27,21 @@ class User(BaseModel):
     )
     stripe_customer_id = Column(String(255), nullable=True, index=True)
     
-    # Relationship to subscriptions
+    # Relationship to subscriptions. lazy="raise" forbids implicit
+    # per-row loads; callers that need the collection opt in with
+    # selectinload (see AuthService), same contract as Keyword's
+    # relationships.
     subscriptions = relationship(
         "Subscription",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="dynamic"
+        lazy="raise"
     )
     
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}', tier={self.subscription_tier.value})>"
 
+
+# Resolve the string relationship target above for configure_mappers()
+from app.models import subscription  # noqa: E402,F401
+
@@ -5,9 +5,10 @@ Sets up scheduled jobs to run the daily pipeline automatically.
 """
 
 import logging
+import os
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor
 from apscheduler.jobstores.memory import MemoryJobStore
 
 from app.services.daily_pipeline import run_daily_pipeline
@@ -24,7 +25,15 @@ def create_scheduler() -> BackgroundScheduler:
         Configured BackgroundScheduler
     """
     jobstores = {"default": MemoryJobStore()}
-    executors = {"default": ThreadPoolExecutor(2)}
+    # Default pool sized so future I/O-bound jobs (hourly refreshes,
+    # trends backfills) don't queue behind each other; jobs are mostly
+    # waiting on the network, so 20 threads is cheap. CPU-bound jobs
+    # (e.g. bulk score recomputation) should be added with
+    # executor="process" to run outside the GIL.
+    executors = {
+        "default": ThreadPoolExecutor(20),
+        "process": ProcessPoolExecutor(max(1, os.cpu_count() or 1)),
+    }
     job_defaults = {
         "coalesce": True,  # Combine multiple pending executions
         "max_instances": 1,  # Only one instance running at a time
@@ -3,8 +3,12 @@ Authentication service for user management and magic links.
 """
 
 import logging
+from functools import lru_cache
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, raiseload, selectinload
 
 from app.models.user import User, SubscriptionTier
 from app.utils.auth import create_access_token, create_magic_link_token, verify_magic_link_token
@@ -37,17 +41,23 @@ class AuthService:
         # Normalize email
         email = email.lower().strip()
 
-        # Get or create user
-        user = db.query(User).filter(User.email == email).first()
-        if not user:
-            user = User(
-                email=email,
-                subscription_tier=SubscriptionTier.FREE,
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            logger.info(f"Created new user: {email}")
+        # Get or create in one atomic statement: INSERT ... ON CONFLICT
+        # (email) DO UPDATE ... RETURNING collapses the SELECT +
+        # conditional INSERT + refresh into a single round trip and
+        # closes the duplicate-key race under concurrent logins. The
+        # no-op DO UPDATE makes RETURNING yield the existing row on
+        # conflict. Dialect-gated like KeywordService's bulk inserts.
+        insert_fn = (
+            pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        )
+        stmt = (
+            insert_fn(User)
+            .values(email=email, subscription_tier=SubscriptionTier.FREE)
+            .on_conflict_do_update(index_elements=["email"], set_={"email": email})
+            .returning(User)
+        )
+        db.scalars(stmt).one()
+        db.commit()
 
         # Generate magic link token
         magic_link_token = create_magic_link_token(email)
@@ -81,8 +91,10 @@ class AuthService:
             logger.warning("Invalid magic link token")
             return None
 
-        # Get user
-        user = db.query(User).filter(User.email == email).first()
+        # Get user (raiseload: this path reads columns only)
+        user = db.execute(
+            select(User).where(User.email == email).options(raiseload("*"))
+        ).scalar_one_or_none()
         if not user:
             logger.warning(f"User not found for email: {email}")
             return None
@@ -103,8 +115,10 @@ class AuthService:
         }
 
     def get_user_by_id(self, db: Session, user_id: int) -> Optional[User]:
-        """Get user by ID."""
-        return db.query(User).filter(User.id == user_id).first()
+        """Get user by ID (columns only; relationship access raises)."""
+        return db.execute(
+            select(User).where(User.id == user_id).options(raiseload("*"))
+        ).scalar_one_or_none()
 
     def is_paid_user(self, db: Session, user_id: int) -> bool:
         """
@@ -117,7 +131,16 @@ class AuthService:
         Returns:
             True if user has paid subscription, False otherwise
         """
-        user = self.get_user_by_id(db, user_id)
+        from app.models.subscription import SubscriptionStatus
+
+        # One fetch with the subscriptions batched in via selectinload:
+        # a fixed two statements regardless of what checks accrete
+        # here, instead of a separate subscription query per check
+        user = db.execute(
+            select(User)
+            .where(User.id == user_id)
+            .options(selectinload(User.subscriptions), raiseload("*"))
+        ).scalar_one_or_none()
         if not user:
             return False
 
@@ -125,15 +148,22 @@ class AuthService:
         if user.subscription_tier == SubscriptionTier.PAID:
             return True
 
-        # Check active subscription
-        from app.models.subscription import Subscription, SubscriptionStatus
-
-        active_subscription = (
-            db.query(Subscription)
-            .filter(Subscription.user_id == user_id)
-            .filter(Subscription.status == SubscriptionStatus.ACTIVE)
-            .first()
+        # Check active subscription in the loaded collection
+        return any(
+            subscription.status == SubscriptionStatus.ACTIVE
+            for subscription in user.subscriptions
         )
 
-        return active_subscription is not None
+
+@lru_cache(maxsize=1)
+def get_auth_service() -> AuthService:
+    """
+    Shared AuthService instance.
+
+    AuthService keeps no per-request state (sessions are passed into
+    every method), so one instance serves all requests. Constructing it
+    fresh in every auth dependency rebuilt the EmailService on each
+    request on the hot path.
+    """
+    return AuthService()
 
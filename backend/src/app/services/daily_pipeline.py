@@ -10,14 +10,17 @@ Runs the complete daily pipeline:
 """
 
 import asyncio
+import json
 import logging
 import sys
 import subprocess
+import threading
 from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import SessionLocal
 from app.services.tiktok_ingestion import (
     TikTokIngestionService,
@@ -26,10 +29,66 @@ from app.services.tiktok_ingestion import (
 from app.services.google_trends import GoogleTrendsService
 from app.services.momentum_service import MomentumService
 from app.services.keyword_service import KeywordService
+from app.services.trends_cache import TrendsCache
 from app.models.keyword import Keyword
 
 logger = logging.getLogger(__name__)
 
+# Per-thread MomentumService instances for the scoring fan-out:
+# TrendReq mutates per-request state in build_payload, so worker
+# threads must not share one (same pattern as scripts/fetch_google_trends)
+_thread_services = threading.local()
+
+
+def _score_chunk(keyword_specs: List[Tuple[int, str]], snapshot_date: date):
+    """Score a chunk of keywords; runs on a worker thread.
+
+    Opens its own session (the sync Session is not thread-safe) and
+    uses a thread-local MomentumService. Cache-fresh keywords are
+    served from the database; the misses share one multi-keyword
+    Google Trends request (up to 5 terms per build_payload call), so a
+    chunk costs at most one HTTPS round trip instead of one per
+    keyword. Returns (keyword_text, snapshot column dict or None)
+    pairs without writing: the pipeline collects all rows and persists
+    them in one bulk upsert.
+    """
+    service = getattr(_thread_services, "momentum", None)
+    if service is None:
+        service = MomentumService()
+        _thread_services.momentum = service
+
+    db = SessionLocal()
+    try:
+        cached = TrendsCache.get_cached_many(
+            db, [keyword_id for keyword_id, _ in keyword_specs], max_age_days=7
+        )
+
+        missing = [
+            keyword for keyword_id, keyword in keyword_specs
+            if keyword_id not in cached
+        ]
+        fetched = service.trends_service.fetch_batch(missing) if missing else {}
+
+        results = []
+        for keyword_id, keyword in keyword_specs:
+            trends_data = cached.get(keyword_id) or fetched.get(keyword)
+            if not trends_data:
+                logger.error("Failed to fetch trends data for keyword: %s", keyword)
+                results.append((keyword, None))
+                continue
+
+            row = service.compute_score_row(
+                db=db,
+                keyword_id=keyword_id,
+                snapshot_date=snapshot_date,
+                trends_data=trends_data,
+            )
+            results.append((keyword, row))
+
+        return results
+    finally:
+        db.close()
+
 
 class DailyPipeline:
     """Orchestrates the daily data processing pipeline."""
@@ -104,69 +163,112 @@ class DailyPipeline:
                 results["errors"].append(error_msg)
 
             # Step 3: Get all keywords (or limit if specified)
+            # Run in a worker thread: run_pipeline is async but the
+            # session is sync, and a large result fetch would otherwise
+            # stall the event loop
             logger.info("Step 3: Getting keywords for processing")
             query = db.query(Keyword).order_by(Keyword.created_at.desc())
             if max_keywords:
                 query = query.limit(max_keywords)
-            keywords_to_process = query.all()
+            keywords_to_process = await asyncio.to_thread(query.all)
 
             logger.info(f"Processing {len(keywords_to_process)} keywords")
 
-            # Step 4: Process each keyword (fetch trends, calculate score)
+            # Step 4: Process keywords (fetch trends, calculate scores)
+            # Chunk into Google Trends batches (5 terms share one
+            # request) and fan the chunks out with a bounded semaphore:
+            # N keywords cost roughly ceil(N / 5 / concurrency) * RTT
+            # instead of N * RTT serially. The sync scoring call runs
+            # under asyncio.to_thread so the event loop keeps
+            # scheduling.
             logger.info(
                 "Step 4: Processing keywords (fetching trends and calculating scores)"
             )
-            for i, keyword in enumerate(keywords_to_process, 1):
-                try:
-                    logger.info(
-                        f"Processing keyword {i}/{len(keywords_to_process)}: {keyword.keyword}"
+            sem = asyncio.Semaphore(settings.pipeline_concurrency)
+
+            batch_size = GoogleTrendsService.BATCH_SIZE
+            chunks = [
+                [(k.id, k.keyword) for k in keywords_to_process[i : i + batch_size]]
+                for i in range(0, len(keywords_to_process), batch_size)
+            ]
+
+            # Progress is logged every ~50 keywords rather than per
+            # keyword: with thousands of keywords, a formatted line and
+            # stderr write apiece is measurable GIL-holding I/O
+            total = len(keywords_to_process)
+            processed = 0
+
+            async def _process(chunk: List[Tuple[int, str]]):
+                nonlocal processed
+                async with sem:
+                    outcome = await asyncio.to_thread(
+                        _score_chunk, chunk, snapshot_date
                     )
+                processed += len(chunk)
+                if processed % 50 == 0 or processed == total:
+                    logger.info("Step 4 progress: %d/%d keywords", processed, total)
+                return outcome
+
+            outcomes = await asyncio.gather(
+                *(_process(c) for c in chunks),
+                return_exceptions=True,
+            )
 
-                    snapshot = self.momentum_service.calculate_and_save_score(
-                        db=db,
-                        keyword_id=keyword.id,
-                        snapshot_date=snapshot_date,
-                        use_cache=True,
+            snapshot_rows: List[Dict] = []
+            for chunk, outcome in zip(chunks, outcomes):
+                if isinstance(outcome, BaseException):
+                    results["scores_failed"] += len(chunk)
+                    error_msg = (
+                        f"Error processing keywords "
+                        f"{[keyword for _, keyword in chunk]}: {outcome}"
                     )
+                    logger.error(error_msg)
+                    results["errors"].append(error_msg)
+                    # Continue with next chunk (don't crash entire pipeline)
+                    continue
 
-                    if snapshot:
+                for keyword, row in outcome:
+                    if row:
+                        snapshot_rows.append(row)
                         results["scores_calculated"] += 1
-                        logger.debug(
-                            f"Score calculated for '{keyword.keyword}': "
-                            f"{snapshot.momentum_score}/100"
-                        )
                     else:
                         results["scores_failed"] += 1
                         logger.warning(
-                            f"Failed to calculate score for '{keyword.keyword}'"
+                            "Failed to calculate score for '%s'", keyword
                         )
 
+            # One bulk upsert for all computed rows: a single
+            # executemany-style round trip (and one fsync on SQLite)
+            # instead of a commit per keyword
+            if snapshot_rows:
+                try:
+                    await asyncio.to_thread(
+                        MomentumService.bulk_upsert_snapshots, db, snapshot_rows
+                    )
+                    logger.info(f"Bulk-saved {len(snapshot_rows)} snapshots")
                 except Exception as e:
-                    results["scores_failed"] += 1
-                    error_msg = f"Error processing keyword '{keyword.keyword}': {e}"
+                    error_msg = f"Error bulk-saving snapshots: {e}"
                     logger.error(error_msg, exc_info=True)
                     results["errors"].append(error_msg)
-                    # Continue with next keyword (don't crash entire pipeline)
-
-            end_time = datetime.utcnow()
-            duration = (end_time - start_time).total_seconds()
+                    results["scores_failed"] += len(snapshot_rows)
+                    results["scores_calculated"] -= len(snapshot_rows)
 
-            results["end_time"] = end_time.isoformat()
-            results["duration_seconds"] = duration
-            results["success"] = len(results["errors"]) == 0
-
-            logger.info(
-                f"Pipeline completed in {duration:.2f}s: "
-                f"{results['scores_calculated']} scores calculated, "
-                f"{results['scores_failed']} failed, "
-                f"{len(results['errors'])} errors"
-            )
-
-            # Step 5: Generate static public pages
-            logger.info("Step 5: Generating static public pages")
+            # Step 5: Refresh the latest-snapshot cache table so the
+            # list endpoints serve today's scores without recomputing
+            # groupwise-max per request
+            logger.info("Step 5: Refreshing latest snapshot cache")
             try:
-                from app.config import settings
+                # Off the loop for the same reason as step 3: the
+                # DELETE + INSERT...SELECT holds the connection for a while
+                await asyncio.to_thread(KeywordService.refresh_latest_snapshots, db)
+            except Exception as e:
+                error_msg = f"Error refreshing latest snapshot cache: {e}"
+                logger.error(error_msg, exc_info=True)
+                results["errors"].append(error_msg)
 
+            # Step 6: Generate static public pages
+            logger.info("Step 6: Generating static public pages")
+            try:
                 # Build public pages
                 public_pages_dir = getattr(
                     settings, "public_pages_dir", "./public_generated"
@@ -177,35 +279,51 @@ class DailyPipeline:
                 # Script is in backend/scripts/, we're in backend/src/app/services/
                 # So go up 4 levels: services -> app -> src -> backend
                 backend_dir = Path(__file__).parent.parent.parent.parent
-                script_path = backend_dir / "scripts" / "build_public_pages.py"
-
-                cmd = [
-                    sys.executable,
-                    "-m",
-                    "scripts.build_public_pages",
-                    "--out",
-                    temp_dir,
-                    "--date",
-                    snapshot_date.isoformat(),
-                ]
-
-                logger.info(f"Running: {' '.join(cmd)}")
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    cwd=str(backend_dir),
-                )
 
-                if result.returncode == 0:
-                    logger.info("Public pages generated successfully")
+                if settings.build_pages_in_process:
+                    # In-process build: skips interpreter startup and
+                    # the full re-import of the app module graph that a
+                    # subprocess pays on every nightly run. Runs on a
+                    # worker thread to keep the event loop free.
+                    if str(backend_dir) not in sys.path:
+                        sys.path.insert(0, str(backend_dir))
+                    from scripts.build_public_pages import build_pages
+
+                    pages = await asyncio.to_thread(
+                        build_pages, temp_dir, snapshot_date
+                    )
+                    logger.info(f"Public pages generated successfully ({pages} pages)")
                     results["public_pages_generated"] = True
                     results["public_pages_dir"] = temp_dir
                 else:
-                    error_msg = f"Failed to generate public pages: {result.stderr}"
-                    logger.error(error_msg)
-                    results["errors"].append(error_msg)
-                    results["public_pages_generated"] = False
+                    # Subprocess fallback: isolated interpreter, slower
+                    cmd = [
+                        sys.executable,
+                        "-m",
+                        "scripts.build_public_pages",
+                        "--out",
+                        temp_dir,
+                        "--date",
+                        snapshot_date.isoformat(),
+                    ]
+
+                    logger.info(f"Running: {' '.join(cmd)}")
+                    result = subprocess.run(
+                        cmd,
+                        capture_output=True,
+                        text=True,
+                        cwd=str(backend_dir),
+                    )
+
+                    if result.returncode == 0:
+                        logger.info("Public pages generated successfully")
+                        results["public_pages_generated"] = True
+                        results["public_pages_dir"] = temp_dir
+                    else:
+                        error_msg = f"Failed to generate public pages: {result.stderr}"
+                        logger.error(error_msg)
+                        results["errors"].append(error_msg)
+                        results["public_pages_generated"] = False
 
             except Exception as e:
                 error_msg = f"Error generating public pages: {e}"
@@ -213,6 +331,31 @@ class DailyPipeline:
                 results["errors"].append(error_msg)
                 results["public_pages_generated"] = False
 
+            end_time = datetime.utcnow()
+            duration = (end_time - start_time).total_seconds()
+
+            results["end_time"] = end_time.isoformat()
+            results["duration_seconds"] = duration
+            results["success"] = len(results["errors"]) == 0
+
+            # One machine-parseable summary line for structured log
+            # consumers instead of scattered per-step totals
+            logger.info(
+                "Pipeline summary: %s",
+                json.dumps(
+                    {
+                        "snapshot_date": results["snapshot_date"],
+                        "duration_seconds": round(duration, 2),
+                        "keywords_fetched": results["keywords_fetched"],
+                        "keywords_saved": results["keywords_saved"],
+                        "scores_calculated": results["scores_calculated"],
+                        "scores_failed": results["scores_failed"],
+                        "error_count": len(results["errors"]),
+                        "success": results["success"],
+                    }
+                ),
+            )
+
             return results
 
         except Exception as e:
@@ -2,16 +2,54 @@
 Email service for sending magic links.
 """
 
+import asyncio
 import logging
 from typing import Optional
 import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from jinja2 import Environment
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Email bodies compiled once at import instead of rebuilt from
+# f-strings on every send. The HTML part renders with autoescape so
+# any future dynamic content stays HTML-safe; the plain-text part must
+# not be entity-escaped, so it uses a non-escaping environment.
+_HTML_ENV = Environment(autoescape=True)
+_TEXT_ENV = Environment()
+
+_HTML_TEMPLATE = _HTML_ENV.from_string(
+    """
+    <html>
+      <body>
+        <h2>Login to TikTok Keyword Momentum Tracker</h2>
+        <p>Click the link below to sign in:</p>
+        <p><a href="{{ verify_url }}" style="background-color: #3B82F6; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">Sign In</a></p>
+        <p>Or copy and paste this link into your browser:</p>
+        <p>{{ verify_url }}</p>
+        <p>This link will expire in 15 minutes.</p>
+        <p>If you didn't request this link, you can safely ignore this email.</p>
+      </body>
+    </html>
+    """
+)
+
+_TEXT_TEMPLATE = _TEXT_ENV.from_string(
+    """
+    Login to TikTok Keyword Momentum Tracker
+
+    Click the link below to sign in:
+    {{ verify_url }}
+
+    This link will expire in 15 minutes.
+
+    If you didn't request this link, you can safely ignore this email.
+    """
+)
+
 
 class EmailService:
     """Service for sending emails."""
@@ -23,6 +61,29 @@ class EmailService:
         self.smtp_user = settings.smtp_user
         self.smtp_password = settings.smtp_password
         self.from_email = settings.smtp_from_email or settings.smtp_user
+        # Long-lived SMTP client, created lazily on first send. Each
+        # aiosmtplib.send() pays TCP + STARTTLS + AUTH (often 500ms+);
+        # keeping one authenticated connection open amortizes that
+        # across sends, like HTTP keep-alive. The lock serializes
+        # sends: one SMTP connection handles one transaction at a time.
+        self._client: Optional[aiosmtplib.SMTP] = None
+        self._client_lock = asyncio.Lock()
+
+    async def _ensure_connected(self) -> aiosmtplib.SMTP:
+        """Return the shared SMTP client, connecting and authenticating
+        if needed. Caller must hold self._client_lock."""
+        if self._client is None:
+            self._client = aiosmtplib.SMTP(
+                hostname=self.smtp_host,
+                port=self.smtp_port,
+                start_tls=True,
+            )
+
+        if not self._client.is_connected:
+            await self._client.connect()
+            await self._client.login(self.smtp_user, self.smtp_password)
+
+        return self._client
 
     async def send_magic_link(
         self, email: str, magic_link: str, frontend_url: str = "http://localhost:3000"
@@ -52,32 +113,9 @@ class EmailService:
             message["From"] = self.from_email
             message["To"] = email
 
-            # Create HTML email body
-            html_body = f"""
-            <html>
-              <body>
-                <h2>Login to TikTok Keyword Momentum Tracker</h2>
-                <p>Click the link below to sign in:</p>
-                <p><a href="{verify_url}" style="background-color: #3B82F6; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">Sign In</a></p>
-                <p>Or copy and paste this link into your browser:</p>
-                <p>{verify_url}</p>
-                <p>This link will expire in 15 minutes.</p>
-                <p>If you didn't request this link, you can safely ignore this email.</p>
-              </body>
-            </html>
-            """
-
-            # Create plain text email body
-            text_body = f"""
-            Login to TikTok Keyword Momentum Tracker
-
-            Click the link below to sign in:
-            {verify_url}
-
-            This link will expire in 15 minutes.
-
-            If you didn't request this link, you can safely ignore this email.
-            """
+            # Render the pre-compiled email bodies
+            html_body = _HTML_TEMPLATE.render(verify_url=verify_url)
+            text_body = _TEXT_TEMPLATE.render(verify_url=verify_url)
 
             # Attach parts
             text_part = MIMEText(text_body, "plain")
@@ -85,15 +123,16 @@ class EmailService:
             message.attach(text_part)
             message.attach(html_part)
 
-            # Send email
-            await aiosmtplib.send(
-                message,
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                username=self.smtp_user,
-                password=self.smtp_password,
-                start_tls=True,
-            )
+            # Send over the persistent connection; if the server
+            # dropped it while idle, reconnect once and retry
+            async with self._client_lock:
+                client = await self._ensure_connected()
+                try:
+                    await client.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    logger.info("SMTP connection dropped, reconnecting")
+                    client = await self._ensure_connected()
+                    await client.send_message(message)
 
             logger.info(f"Magic link email sent to {email}")
             return True
@@ -6,10 +6,13 @@ Implements caching to minimize API calls and handle rate limiting.
 """
 
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from sqlalchemy.orm import Session
+import requests
+import pytrends.request
 from pytrends.request import TrendReq
 import pandas as pd
 
@@ -19,6 +22,40 @@ from app.utils.retry import retry_sync
 
 logger = logging.getLogger(__name__)
 
+_thread_sessions = threading.local()
+
+
+def _pooled_session() -> requests.Session:
+    """Per-thread keep-alive session used for all pytrends requests."""
+    session = getattr(_thread_sessions, "session", None)
+    if session is None:
+        session = requests.Session()
+        _thread_sessions.session = session
+    return session
+
+
+class _RequestsProxy:
+    """
+    requests-module stand-in that hands pytrends a pooled session.
+
+    pytrends builds a throwaway requests.session() inside every call,
+    so each Google Trends request pays TCP and TLS setup again. It
+    never closes those sessions, so substituting a per-thread
+    keep-alive session is safe and amortizes the handshake across all
+    of a thread's fetches. Only pytrends' own module sees this proxy;
+    everything else still resolves to the real requests module.
+    """
+
+    @staticmethod
+    def session() -> requests.Session:
+        return _pooled_session()
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+pytrends.request.requests = _RequestsProxy()
+
 
 class GoogleTrendsService:
     """Service for fetching Google Trends data with caching."""
@@ -27,6 +64,9 @@ class GoogleTrendsService:
     MIN_REQUEST_DELAY = 1.0  # seconds between requests
     MAX_RETRIES = 3
 
+    # Google Trends accepts up to 5 terms per request
+    BATCH_SIZE = 5
+
     def __init__(self, hl: str = "en-US", tz: int = 360):
         """
         Initialize Google Trends service.
@@ -40,6 +80,13 @@ class GoogleTrendsService:
         self.hl = hl
         self.tz = tz
 
+    def close(self):
+        """Close this thread's pooled HTTP session."""
+        session = getattr(_thread_sessions, "session", None)
+        if session is not None:
+            session.close()
+            _thread_sessions.session = None
+
     def _rate_limit(self):
         """Enforce rate limiting between requests."""
         if self.last_request_time is not None:
@@ -121,6 +168,95 @@ class GoogleTrendsService:
             )
             return None
 
+    def fetch_batch(
+        self,
+        keywords: List[str],
+        timeframe: str = "today 12-m",
+        geo: str = "",
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch Google Trends data for several keywords per request.
+
+        Google Trends accepts up to 5 terms in one build_payload call,
+        so a batch of N keywords costs ceil(N / 5) HTTPS round trips
+        instead of N. Values in a multi-term response are normalized
+        against the batch's peak rather than each keyword's own peak;
+        that rescales each series by a constant factor, which the
+        relative momentum measures (lift, acceleration, noise) are
+        insensitive to.
+
+        Args:
+            keywords: Keywords to fetch (any length; chunked internally)
+            timeframe: Time range (default: "today 12-m" for past 12 months)
+            geo: Geographic location (empty string = worldwide)
+
+        Returns:
+            Dictionary mapping each keyword to its trends data in the
+            same shape as fetch_trends_data, or None where the fetch
+            failed or returned no data
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {kw: None for kw in keywords}
+
+        for start in range(0, len(keywords), self.BATCH_SIZE):
+            group = keywords[start : start + self.BATCH_SIZE]
+            self._rate_limit()
+
+            def _fetch():
+                self.pytrends.build_payload(
+                    group,
+                    cat=0,  # All categories
+                    timeframe=timeframe,
+                    geo=geo,
+                    gprop="",  # Web search (not images, news, etc.)
+                )
+                return self.pytrends.interest_over_time()
+
+            try:
+                frame = retry_sync(
+                    _fetch,
+                    max_attempts=self.MAX_RETRIES,
+                    delay=2.0,
+                    exceptions=(Exception,),
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to fetch Google Trends batch {group} after retries: {e}"
+                )
+                continue
+
+            if frame is None or frame.empty:
+                logger.warning(f"No data returned for batch: {group}")
+                continue
+
+            fetched_at = datetime.utcnow().isoformat()
+            for keyword in group:
+                if keyword not in frame.columns:
+                    logger.warning(f"No column returned for keyword: {keyword}")
+                    continue
+
+                # Slice out this keyword's column (plus isPartial) so
+                # each cached entry matches the single-keyword shape
+                columns = [keyword]
+                if "isPartial" in frame.columns:
+                    columns.append("isPartial")
+                sub_frame = frame[columns]
+
+                results[keyword] = {
+                    "keyword": keyword,
+                    "timeframe": timeframe,
+                    "geo": geo,
+                    "fetched_at": fetched_at,
+                    "data": sub_frame.to_dict(orient="records"),
+                    "columns": list(sub_frame.columns),
+                }
+
+            logger.info(
+                f"Fetched Google Trends batch of {len(group)} keywords: "
+                f"{len(frame)} data points"
+            )
+
+        return results
+
     def get_weekly_values(self, trends_data: Dict[str, Any]) -> List[float]:
         """
         Extract weekly values from trends data.
@@ -3,11 +3,15 @@ Service for managing keywords in the database.
 """
 
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import delete, desc, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.models.keyword import Keyword
+from app.models.daily_snapshot import DailySnapshot
+from app.models.latest_keyword_snapshot import LatestKeywordSnapshot
 from app.utils.keyword_utils import normalize_keyword
 
 logger = logging.getLogger(__name__)
@@ -48,55 +52,102 @@ class KeywordService:
         
         return keyword
     
+    @staticmethod
+    def bulk_get_or_create(db: Session, keyword_texts: List[str]) -> Dict[str, Keyword]:
+        """
+        Get or create many keywords in two round trips.
+
+        Calling get_or_create_keyword in a loop costs a SELECT (and
+        possibly an INSERT plus commit) per keyword. This issues one
+        INSERT ... ON CONFLICT DO NOTHING for all missing keywords and
+        one SELECT to load them, regardless of how many were passed.
+
+        Args:
+            db: Database session
+            keyword_texts: Keyword strings (raw, will be normalized)
+
+        Returns:
+            Mapping of normalized keyword text to Keyword instance
+        """
+        normalized = []
+        seen = set()
+        for keyword_text in keyword_texts:
+            text = normalize_keyword(keyword_text)
+            if text and text not in seen:
+                seen.add(text)
+                normalized.append(text)
+
+        if not normalized:
+            return {}
+
+        values = [{"keyword": text} for text in normalized]
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = pg_insert(Keyword).values(values)
+        else:
+            stmt = sqlite_insert(Keyword).values(values)
+        db.execute(stmt.on_conflict_do_nothing(index_elements=["keyword"]))
+        db.commit()
+
+        keywords = (
+            db.query(Keyword).filter(Keyword.keyword.in_(normalized)).all()
+        )
+        return {keyword.keyword: keyword for keyword in keywords}
+
+    # Keywords per INSERT statement in bulk_create_keywords
+    INSERT_CHUNK_SIZE = 1000
+
     @staticmethod
     def bulk_create_keywords(db: Session, keywords: List[str]) -> int:
         """
         Bulk create keywords, skipping duplicates.
-        
+
+        One INSERT ... ON CONFLICT DO NOTHING per 1000-keyword chunk:
+        the unique index on keyword arbitrates duplicates inside the
+        statement, replacing the old read-then-write pattern (SELECT
+        existing, then per-object ORM inserts) and closing its race
+        against concurrent writers.
+
         Args:
             db: Database session
             keywords: List of keyword strings
-            
+
         Returns:
             Number of new keywords created
         """
-        created_count = 0
+        # Normalize and de-duplicate, preserving order
         normalized_keywords = []
-        
-        # Normalize all keywords first
+        seen = set()
         for keyword_text in keywords:
             normalized = normalize_keyword(keyword_text)
-            if normalized:
+            if normalized and normalized not in seen:
+                seen.add(normalized)
                 normalized_keywords.append(normalized)
-        
+
         if not normalized_keywords:
             return 0
-        
-        # Get existing keywords in one query
-        existing_keywords = set(
-            db.query(Keyword.keyword).filter(
-                Keyword.keyword.in_(normalized_keywords)
-            ).all()
-        )
-        existing_keywords = {kw[0] for kw in existing_keywords}
-        
-        # Create new keywords
-        new_keywords = []
-        for normalized in normalized_keywords:
-            if normalized not in existing_keywords:
-                new_keywords.append(Keyword(keyword=normalized))
-                created_count += 1
-        
-        if new_keywords:
-            db.add_all(new_keywords)
-            try:
-                db.commit()
-                logger.info(f"Created {created_count} new keywords in database")
-            except Exception as e:
-                logger.error(f"Error saving keywords to database: {e}")
-                db.rollback()
-                raise
-        
+
+        is_postgres = db.get_bind().dialect.name == "postgresql"
+        chunk_size = KeywordService.INSERT_CHUNK_SIZE
+        created_count = 0
+        try:
+            for start in range(0, len(normalized_keywords), chunk_size):
+                chunk = normalized_keywords[start : start + chunk_size]
+                values = [{"keyword": text} for text in chunk]
+                if is_postgres:
+                    stmt = pg_insert(Keyword).values(values)
+                else:
+                    stmt = sqlite_insert(Keyword).values(values)
+                result = db.execute(
+                    stmt.on_conflict_do_nothing(index_elements=["keyword"])
+                )
+                created_count += max(result.rowcount or 0, 0)
+            db.commit()
+            logger.info(f"Created {created_count} new keywords in database")
+        except Exception as e:
+            logger.error(f"Error saving keywords to database: {e}")
+            db.rollback()
+            raise
+
         return created_count
     
     @staticmethod
@@ -123,3 +174,49 @@ class KeywordService:
         """Get total count of keywords."""
         return db.query(func.count(Keyword.id)).scalar()
 
+    @staticmethod
+    def refresh_latest_snapshots(db: Session) -> int:
+        """
+        Rewrite the latest_keyword_snapshot cache table.
+
+        Run by the daily pipeline after new snapshots are saved. One
+        window-function pass over daily_snapshots picks each keyword's
+        newest snapshot and replaces the cache contents in a single
+        DELETE + INSERT ... SELECT, inside one transaction so readers
+        never see a partially refreshed table.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of keywords in the refreshed cache
+        """
+        ranked = select(
+            DailySnapshot.keyword_id,
+            DailySnapshot.snapshot_date,
+            DailySnapshot.momentum_score,
+            func.row_number()
+            .over(
+                partition_by=DailySnapshot.keyword_id,
+                order_by=desc(DailySnapshot.snapshot_date),
+            )
+            .label("recency_rank"),
+        ).subquery()
+
+        db.execute(delete(LatestKeywordSnapshot))
+        result = db.execute(
+            insert(LatestKeywordSnapshot).from_select(
+                ["keyword_id", "snapshot_date", "momentum_score"],
+                select(
+                    ranked.c.keyword_id,
+                    ranked.c.snapshot_date,
+                    ranked.c.momentum_score,
+                ).where(ranked.c.recency_rank == 1),
+            )
+        )
+        db.commit()
+
+        count = result.rowcount or 0
+        logger.info(f"Refreshed latest_keyword_snapshot cache: {count} keywords")
+        return count
+
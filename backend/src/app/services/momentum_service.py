@@ -7,6 +7,8 @@ Orchestrates the calculation and storage of momentum scores for keywords.
 import logging
 from datetime import date, datetime
 from typing import List, Optional, Dict, Any
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.models.keyword import Keyword
@@ -21,11 +23,130 @@ logger = logging.getLogger(__name__)
 class MomentumService:
     """Service for calculating and storing momentum scores."""
 
+    # Rows per bulk upsert statement: large enough to amortize the
+    # round trip, small enough to keep statements reasonable
+    INSERT_CHUNK_SIZE = 1000
+
     def __init__(self):
         """Initialize the momentum service."""
         self.trends_service = GoogleTrendsService()
         self.scoring_service = ScoringService()
 
+    def compute_score_row(
+        self,
+        db: Session,
+        keyword_id: int,
+        snapshot_date: Optional[date] = None,
+        trends_data: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Compute a keyword's momentum score without writing the snapshot.
+
+        Same fetch/cache behavior as calculate_and_save_score, but
+        returns a column mapping for daily_snapshots instead of
+        committing a row. Callers collect the mappings and flush them
+        in one bulk_upsert_snapshots call, so a pipeline run pays one
+        write round trip instead of one commit per keyword.
+
+        Returns:
+            Column dict for DailySnapshot, or None if computation failed
+        """
+        if snapshot_date is None:
+            snapshot_date = date.today()
+
+        # Get keyword
+        keyword = db.query(Keyword).filter(Keyword.id == keyword_id).first()
+        if not keyword:
+            logger.error(f"Keyword not found: {keyword_id}")
+            return None
+
+        # Get trends data if not provided
+        if trends_data is None:
+            if use_cache:
+                trends_data = TrendsCache.get_cached(
+                    db, keyword_id, max_age_days=7, snapshot_date=snapshot_date
+                )
+
+            if trends_data is None:
+                # Fetch fresh data; the bulk upsert persists it with the
+                # score, so no separate set_cached write is needed
+                logger.info(f"Fetching Google Trends data for keyword: {keyword.keyword}")
+                trends_data = self.trends_service.fetch_trends_data(
+                    keyword.keyword, timeframe="today 12-m", geo=""
+                )
+
+                if not trends_data:
+                    logger.error(f"Failed to fetch trends data for keyword: {keyword.keyword}")
+                    return None
+
+        # Calculate score
+        score_result = self.scoring_service.calculate_score_from_trends_data(trends_data)
+
+        if score_result is None:
+            logger.warning(
+                f"Insufficient data to calculate score for keyword: {keyword.keyword}"
+            )
+            return None
+
+        return {
+            "keyword_id": keyword_id,
+            "snapshot_date": snapshot_date,
+            "momentum_score": score_result["momentum_score"],
+            "raw_score": score_result["raw_score"],
+            "lift_value": score_result["lift_value"],
+            "acceleration_value": score_result["acceleration_value"],
+            "novelty_value": score_result["novelty_value"],
+            "noise_value": score_result["noise_value"],
+            "google_trends_data": trends_data,
+        }
+
+    @staticmethod
+    def bulk_upsert_snapshots(db: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Upsert snapshot rows in chunked multi-row statements.
+
+        ON CONFLICT (keyword_id, snapshot_date) DO UPDATE replaces the
+        per-keyword get-or-create + commit pattern: one round trip and
+        one fsync per chunk instead of per row. Dialect-gated like
+        KeywordService's bulk inserts.
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        if not rows:
+            return 0
+
+        dialect = db.get_bind().dialect.name
+        insert_fn = pg_insert if dialect == "postgresql" else sqlite_insert
+
+        written = 0
+        try:
+            for start in range(0, len(rows), MomentumService.INSERT_CHUNK_SIZE):
+                chunk = rows[start : start + MomentumService.INSERT_CHUNK_SIZE]
+                stmt = insert_fn(DailySnapshot).values(chunk)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["keyword_id", "snapshot_date"],
+                    set_={
+                        "momentum_score": stmt.excluded.momentum_score,
+                        "raw_score": stmt.excluded.raw_score,
+                        "lift_value": stmt.excluded.lift_value,
+                        "acceleration_value": stmt.excluded.acceleration_value,
+                        "novelty_value": stmt.excluded.novelty_value,
+                        "noise_value": stmt.excluded.noise_value,
+                        "google_trends_data": stmt.excluded.google_trends_data,
+                    },
+                )
+                result = db.execute(stmt)
+                written += max(result.rowcount or 0, 0)
+
+            db.commit()
+            return written
+        except Exception as e:
+            logger.error(f"Error bulk-upserting snapshots: {e}")
+            db.rollback()
+            raise
+
     def calculate_and_save_score(
         self,
         db: Session,
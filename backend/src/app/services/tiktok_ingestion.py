@@ -301,6 +301,9 @@ async def save_keywords_to_database(db: Session, keywords: List[str]) -> int:
     """
     Save keywords to database, creating new entries for keywords that don't exist.
 
+    The bulk insert runs in a worker thread so the chunked writes don't
+    stall the caller's event loop alongside its HTTP fetches.
+
     Args:
         db: Database session
         keywords: List of keyword strings
@@ -308,4 +311,4 @@ async def save_keywords_to_database(db: Session, keywords: List[str]) -> int:
     Returns:
         Number of new keywords created
     """
-    return KeywordService.bulk_create_keywords(db, keywords)
+    return await asyncio.to_thread(KeywordService.bulk_create_keywords, db, keywords)
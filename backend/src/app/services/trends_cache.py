@@ -5,8 +5,9 @@ Provides database-based caching to minimize API calls and handle rate limiting.
 """
 
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
@@ -14,6 +15,33 @@ from app.models.daily_snapshot import DailySnapshot
 
 logger = logging.getLogger(__name__)
 
+# In-process memo over the database cache, in the same TTL-dict style
+# as the auth-path caches: a hot keyword skips even the cache-table
+# query. The snapshot rows remain the durable cache shared across
+# processes and scheduler runs — this layer only saves repeat lookups
+# within one process and dies with it. Keyed by (keyword_id,
+# snapshot_date), with None standing in for "most recent".
+_MEMO_TTL = 21_600.0  # 6 hours, well inside the day-level cache bucket
+_MEMO_MAX = 10_000
+_memo: Dict[Tuple[int, Optional[datetime.date]], Tuple[float, Dict[str, Any]]] = {}
+
+
+def _memo_get(key: Tuple[int, Optional[datetime.date]]) -> Optional[Dict[str, Any]]:
+    entry = _memo.get(key)
+    if entry is None:
+        return None
+    deadline, value = entry
+    if time.monotonic() >= deadline:
+        _memo.pop(key, None)
+        return None
+    return value
+
+
+def _memo_set(key: Tuple[int, Optional[datetime.date]], value: Dict[str, Any]) -> None:
+    if len(_memo) >= _MEMO_MAX:
+        _memo.clear()
+    _memo[key] = (time.monotonic() + _MEMO_TTL, value)
+
 
 class TrendsCache:
     """Cache manager for Google Trends data."""
@@ -37,6 +65,10 @@ class TrendsCache:
         Returns:
             Cached trends data or None
         """
+        memo_hit = _memo_get((keyword_id, snapshot_date))
+        if memo_hit is not None:
+            return memo_hit
+
         query = (
             db.query(DailySnapshot)
             .filter(DailySnapshot.keyword_id == keyword_id)
@@ -65,8 +97,71 @@ class TrendsCache:
                 return None
 
         logger.debug(f"Cache hit for keyword_id={keyword_id}")
+        _memo_set((keyword_id, snapshot_date), snapshot.google_trends_data)
         return snapshot.google_trends_data
 
+    @staticmethod
+    def get_cached_many(
+        db: Session,
+        keyword_ids: List[int],
+        max_age_days: int = 7,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Get cached Google Trends data for many keywords in one query.
+
+        Looking keywords up one at a time costs a round trip each; this
+        fetches every fresh-enough cache entry with a single
+        WHERE keyword_id IN (...) query and picks the newest snapshot
+        per keyword in Python.
+
+        Args:
+            db: Database session
+            keyword_ids: Keyword IDs to look up
+            max_age_days: Maximum age of cached data in days
+
+        Returns:
+            Mapping of keyword_id to cached trends data (missing or
+            stale keywords are absent)
+        """
+        if not keyword_ids:
+            return {}
+
+        cached: Dict[int, Dict[str, Any]] = {}
+        misses = []
+        for keyword_id in keyword_ids:
+            memo_hit = _memo_get((keyword_id, None))
+            if memo_hit is not None:
+                cached[keyword_id] = memo_hit
+            else:
+                misses.append(keyword_id)
+
+        if not misses:
+            return cached
+
+        cutoff = datetime.utcnow().date() - timedelta(days=max_age_days)
+        rows = (
+            db.query(DailySnapshot.keyword_id, DailySnapshot.google_trends_data)
+            .filter(
+                DailySnapshot.keyword_id.in_(misses),
+                DailySnapshot.google_trends_data.isnot(None),
+                DailySnapshot.snapshot_date >= cutoff,
+            )
+            .order_by(
+                DailySnapshot.keyword_id, DailySnapshot.snapshot_date.desc()
+            )
+            .all()
+        )
+
+        for keyword_id, trends_data in rows:
+            if keyword_id not in cached and trends_data:
+                cached[keyword_id] = trends_data
+                _memo_set((keyword_id, None), trends_data)
+
+        logger.debug(
+            f"Cache hits for {len(cached)}/{len(keyword_ids)} keywords"
+        )
+        return cached
+
     @staticmethod
     def set_cached(
         db: Session,
@@ -115,6 +210,9 @@ class TrendsCache:
         db.commit()
         db.refresh(snapshot)
 
+        _memo_set((keyword_id, snapshot_date), trends_data)
+        _memo_set((keyword_id, None), trends_data)
+
         logger.debug(
             f"Cached trends data for keyword_id={keyword_id}, date={snapshot_date}"
         )
@@ -139,6 +237,9 @@ class TrendsCache:
             .update({DailySnapshot.google_trends_data: None})
         )
         db.commit()
+
+        for key in [k for k in _memo if k[0] == keyword_id]:
+            _memo.pop(key, None)
         logger.info(f"Invalidated cache for keyword_id={keyword_id}: {count} snapshots")
         return count
 
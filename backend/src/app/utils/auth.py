@@ -3,8 +3,10 @@ Authentication utilities for JWT token generation and validation.
 """
 
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -109,6 +111,33 @@ def verify_magic_link_token(token: str) -> Optional[str]:
     return email
 
 
+@lru_cache(maxsize=4096)
+def _decode_access_token(token: str) -> Optional[Tuple[int, float]]:
+    """
+    Verify an access token once and memoize (user_id, exp timestamp).
+
+    Signature verification is deterministic — the same token string
+    always yields the same payload — so the HMAC check only needs to
+    run the first time a token is seen. Expiry is time-dependent and
+    cannot be memoized, so the exp claim is returned for the caller to
+    re-check on every hit.
+    """
+    payload = verify_token(token)
+
+    if not payload:
+        return None
+
+    user_id = payload.get("sub")
+    if not user_id:
+        return None
+    try:
+        user_id = int(user_id)
+    except (ValueError, TypeError):
+        return None
+
+    return user_id, float(payload.get("exp") or 0)
+
+
 def get_user_id_from_token(token: str) -> Optional[int]:
     """
     Extract user ID from access token.
@@ -119,17 +148,14 @@ def get_user_id_from_token(token: str) -> Optional[int]:
     Returns:
         User ID or None if invalid
     """
-    payload = verify_token(token)
-    
-    if not payload:
+    entry = _decode_access_token(token)
+
+    if entry is None:
         return None
-    
-    user_id = payload.get("sub")
-    if user_id:
-        try:
-            return int(user_id)
-        except (ValueError, TypeError):
-            return None
-    
-    return None
+
+    user_id, expires_at = entry
+    if expires_at and expires_at <= time.time():
+        return None
+
+    return user_id
 